@@ -1,4 +1,3 @@
-from decimal import getcontext
 from dearpygui.dearpygui import *
 from gui.HGBOpposedWindow import OPP_SETUP_WINDOW, make_opp_window
 from gui.HGBUnopposedWindow import UNOPP_SETUP_WINDOW, make_unopp_window
@@ -26,8 +25,6 @@ As for the GUI, I sincerely apologize. I don't know what I'm doing with GUI prog
 and I'm sure it's a complete mess.
 """
 
-getcontext().prec = 12  # Decimal precision to use if not otherwise specified.
-
 
 def opposed_cb():
     show_item(OPP_SETUP_WINDOW)
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
+import sys
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from decimal import Decimal, getcontext
 from enum import Enum, auto
 from functools import partial
 from itertools import chain
-from typing import Dict, Iterable, List, Mapping
+from operator import methodcaller
+from typing import Callable, Dict, Iterable, List, Mapping
 
-from diceGame.gameObjects import State
+from diceGame.gameObjects import SLOTS, State
 from . import HGBRules as hgb
 
-getcontext().prec = 12
-
 
 class AnalysisType(Enum):
     """Enum to distinguish between boolean analyses and those with a range of
@@ -22,7 +22,7 @@ class AnalysisType(Enum):
     RANGE = auto()
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Analysis:
     """Framework of a statistical analysis that can be run on a PDF (probability
     distribution function).
@@ -40,68 +40,105 @@ class Analysis:
     effect_params: Mapping  # Parameters to select relevant effects from game States
     split_by_source: bool = False  # Perform sub-analysis by Effect source?
     show_if_missing: bool = False  # Show if zero probability of occurring?
+    # Helpers with effect_params baked in, built once per Analysis
+    value_key: hgb.EffectKey = field(init=False, repr=False, compare=False)
+    get_effects: Callable = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.value_key = hgb.effect_value_key(**self.effect_params)
+        self.get_effects = methodcaller("get_effects", **self.effect_params)
 
 
 # Type alias for a probability distribution function
 PDF = hgb.PDF
 
 
-@dataclass
+class TailProb(Mapping):
+    """Probability of seeing AT LEAST a given value, built from a PDF. Reads like a
+    PDF of {value: probability of at least value}, but can also be called with any
+    threshold, e.g. tails(2.5) is the probability of a value >= 2.5."""
+
+    __slots__ = ("_vals", "_tails")
+
+    def __init__(self, totals: PDF = None):
+        totals = totals or {}
+        self._vals = sorted(totals)
+        # Running sum of probabilities walking from the highest value down
+        self._tails = []
+        running = 0.0
+        for val in reversed(self._vals):
+            running += totals[val]
+            self._tails.append(running)
+        self._tails.reverse()
+
+    def __call__(self, threshold: float) -> float:
+        i = bisect_left(self._vals, threshold)
+        return self._tails[i] if i < len(self._tails) else 0.0
+
+    def __getitem__(self, val: float) -> float:
+        i = bisect_left(self._vals, val)
+        if i == len(self._vals) or self._vals[i] != val:
+            raise KeyError(val)
+        return self._tails[i]
+
+    def __iter__(self):
+        return iter(self._vals)
+
+    def __len__(self) -> int:
+        return len(self._vals)
+
+
+@dataclass(**SLOTS)
 class SourceResult:
     """Special class for a Result filtered by source, e.g. damage from fire only"""
 
     source: str
     type: AnalysisType
     totals: PDF = field(default_factory=dict)
-    average: Decimal = Decimal(0)
-    normalized_totals: PDF = field(default_factory=dict)
-    normalized_average: Decimal = Decimal(0)
-    min_totals: PDF = field(default_factory=dict)
+    average: float = 0.0
+    scale: float = 1.0  # Scale used to normalize totals > 0
+    normalized_average: float = 0.0
+    min_totals: TailProb = field(default_factory=TailProb)
+
+    @property
+    def normalized_totals(self) -> PDF:
+        """Normalized probabilities of values > 0. Only built when actually viewed."""
+        return make_normals(self.totals, scale=self.scale)
 
     def __str__(self) -> str:
-        out = f"source: {self.source}, type: {self.type}\n"
-        out += f"totals (Avg: {self.average}):\n"
-        out += "\n".join(f"\t{val:g}: {prob:0.2%}" for val, prob in self.totals.items())
-        out += f"\nnormalized_totals (Avg: {self.normalized_average}):\n"
-        out += "\n".join(
-            f"\t{val:g}: {prob:0.2%}" for val, prob in self.normalized_totals.items()
+        return "\n".join(
+            [
+                f"source: {self.source}, type: {self.type}",
+                f"totals (Avg: {self.average}):",
+                format_pdf(self.totals),
+                f"normalized_totals (Avg: {self.normalized_average}):",
+                format_pdf(self.normalized_totals),
+                "min_totals:",
+                format_pdf(self.min_totals),
+            ]
         )
-        out += f"\nmin_totals:\n"
-        out += "\n".join(
-            f"\t{val:g}: {prob:0.2%}" for val, prob in self.min_totals.items()
-        )
-        return out
-
 
-def print_results(results: List[Dict]):
-    for res in results:
-        print(f"{res['name']} (Avg: {res['average']:0.2f})")
-        print("\n".join(f"\t{k:g}: {v:0.2%}" for k, v in res["totals"].items()))
-        sources = res.get("by_source", [])
-        for source in sources:
-            print(f"\n\t{source['name']} (Avg: {source['average']:0.2g})")
-            print(
-                "\n".join(f"\t\t{k:g}: {v:0.2%}" for k, v in source["totals"].items())
-            )
 
+def format_pdf(pdf: PDF, indent: str = "\t") -> str:
+    """Format a PDF as one indented "value: probability" line per entry"""
+    fmt = f"{indent}{{:g}}: {{:0.2%}}".format
+    return "\n".join([fmt(val, prob) for val, prob in pdf.items()])
 
-class DefaultSourceDict(dict):
-    """Dictionary subclass that creates an empty SourceResult of a specified type
-    for missing keys."""
 
-    def __init__(self, type: AnalysisType):
-        self._type = type
-        super().__init__()
-
-    def __missing__(self, key: str) -> SourceResult:
-        self[key] = value = SourceResult(
-            key,
-            self._type,
-        )
-        return value
+def print_results(results: List[Dict]):
+    # Build the whole report first and write it out in one go
+    lines = []
+    for res in results:
+        lines.append(f"{res['name']} (Avg: {res['average']:0.2f})")
+        lines.append(format_pdf(res["totals"]))
+        for source in res.get("by_source", []):
+            lines.append(f"\n\t{source['name']} (Avg: {source['average']:0.2g})")
+            lines.append(format_pdf(source["totals"], indent="\t\t"))
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
-@dataclass
+@dataclass(**SLOTS)
 class Result:
     """Result of a statistical analysis performed on a set of States. A Result is just
     a container for one or more PDFs giving the probability across all the given States
@@ -111,9 +148,7 @@ class Result:
 
     name: str
     type: AnalysisType
-
-    def __post_init__(self):  # Use post_init to initialize default source type
-        self.sources = DefaultSourceDict(self.type)
+    sources: Dict[str, SourceResult] = field(default_factory=dict)
 
     def __str__(self) -> str:
         out = f"name: {self.name}, type: {self.type}\n"
@@ -207,27 +242,17 @@ STATUS_ANALYSES = {a.name: a for a in status_list}
 analyses = {**BASIC_ANALYSES, **STATUS_ANALYSES}  # Combine analyses into one list
 
 
-def make_normals(totals: PDF, scale: Decimal = None) -> PDF:
+def make_normals(totals: PDF, scale: float = None) -> PDF:
     """Return scaled probabilties of non-zero values only. By default, they are scaled
     to sum to 1.0, but can be arbitrary scaled instead using the scale parameter.
     """
     normalized_totals = {val: prob for val, prob in totals.items() if val > 0}
     if not scale:
         total_probs = sum(normalized_totals.values())
-        total_probs = Decimal(1) if total_probs == 0 else total_probs
-        scale = Decimal(1) / total_probs
+        scale = 1.0 / total_probs if total_probs else 1.0
     return {val: prob * scale for val, prob in normalized_totals.items()}
 
 
-def make_mins(totals: PDF) -> PDF:
-    """Transform probability of each value in PDF into probability of seeing
-    AT LEAST that value."""
-    return {
-        val: sum(prob for t_val, prob in totals.items() if t_val >= val)
-        for val in totals.keys()
-    }
-
-
 def do_analysis(states: Iterable[State], analysis: Analysis) -> Result:
     """Analyze a collection of states for the supplied analysis type"""
     res = Result(analysis.name, analysis.datatype)  # Initialize result
@@ -236,16 +261,14 @@ def do_analysis(states: Iterable[State], analysis: Analysis) -> Result:
     # Create PDF giving probabilities of each discrete value for the specific effect
     #   being analyzed, combined from all the given States.
     # Totals is the heart of the analysis.
-    totals: PDF = group(hgb.effect_value_key(**analysis.effect_params))
-    average = Decimal(sum(val * prob for val, prob in totals.items()))
+    totals: PDF = group(analysis.value_key)
+    average = sum(val * prob for val, prob in totals.items())
     # Generate normalized probabilities (assuming the effect occurs, how likely is each
     #   discrete value > 0 to occur?)
     success_probs = sum(prob for val, prob in totals.items() if val > 0)
-    success_probs = Decimal(1) if success_probs == 0 else success_probs
-    scale = Decimal(1) / success_probs
-    normalized_totals = make_normals(totals, scale=scale)
-    normalized_average = Decimal(
-        sum(val * prob for val, prob in normalized_totals.items())
+    scale = 1.0 / success_probs if success_probs else 1.0  # Don't divide by zero
+    normalized_average = scale * sum(
+        val * prob for val, prob in totals.items() if val > 0
     )
 
     # Gather current analysis results without regard for source yet.
@@ -254,21 +277,19 @@ def do_analysis(states: Iterable[State], analysis: Analysis) -> Result:
         analysis.datatype,
         totals,
         average,
-        normalized_totals,
+        scale,
         normalized_average,
     )
     # Mins (probability AT LEAST x) don't make sense for boolean outcomes
     if analysis.datatype is AnalysisType.RANGE:
-        all_res.min_totals = make_mins(totals)
+        all_res.min_totals = TailProb(totals)
 
     res.sources["All"] = all_res
 
     if analysis.split_by_source:
         # Get all of the individual Effects from EVERY state where that Effect occurs
         # itertools.chain is used to walk an iterable of iterables.
-        effects = chain.from_iterable(
-            state.get_effects(**analysis.effect_params) for state in states
-        )
+        effects = chain.from_iterable(analysis.get_effects(state) for state in states)
         # Make a set of all distinct sources for the found effects
         sources = {eff.source for eff in effects}
 
@@ -280,20 +301,29 @@ def do_analysis(states: Iterable[State], analysis: Analysis) -> Result:
             average = sum(prob * val for prob, val in totals.items())
             # Normalize using total scale, not source scale
             # This preserves the relative probabilities between sources
-            normalized_totals = make_normals(totals, scale=scale)
-            normalized_average = sum(
-                val * prob for val, prob in normalized_totals.items()
+            normalized_average = scale * sum(
+                val * prob for val, prob in totals.items() if val > 0
             )
             source_res = SourceResult(
                 source,
                 analysis.datatype,
                 totals,
                 average,
-                normalized_totals,
+                scale,
                 normalized_average,
             )
             # Again, mins don't make sense with boolean effects
             if analysis.datatype is AnalysisType.RANGE:
-                source_res.min_totals = make_mins(totals)
+                source_res.min_totals = TailProb(totals)
             res.sources[source] = source_res
     return res
+
+
+def do_analyses(
+    states: Iterable[State], to_run: Mapping[str, Analysis] = None
+) -> Dict[str, Result]:
+    """Run several analyses (all of them by default) on the same collection of states.
+    Returns {analysis name: Result}."""
+    states = list(states)  # Every analysis walks the states, so only collect them once
+    to_run = analyses if to_run is None else to_run
+    return {name: do_analysis(states, analysis) for name, analysis in to_run.items()}
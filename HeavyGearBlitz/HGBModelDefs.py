@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import replace
-from decimal import Decimal
-from functools import partial
-from typing import FrozenSet, Mapping, Sequence, Union
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Collection, Dict, Mapping, Sequence, Tuple, Union
 
-from diceGame.diceProbs import all_probs_threshold
+from diceGame.diceProbs import threshold_probs
 from diceGame.gameObjects import Component, State
 
 from .HGBRules import (
@@ -30,213 +29,213 @@ from .HGBRules import (
     ThresholdBonusComponent,
     Trait,
     apply_damage,
+    damage_snapshot,
+    make_effect,
 )
 
 
 class AgileComponent(Component):
     """Convert MoS 0 hits to misses"""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[ResolveTimeSteps.APPLY_HIT_MISS] = self._agile
+        self._eff = Effect(name=RuleEffects.Miss, source="Agile", value=1)
 
-    def _agile(self, state: State) -> FrozenSet[State]:
-        mos = state.sum_effects(name=RuleEffects.MoS)
+    def _agile(self, state: State) -> Collection[State]:
+        mos = state.sum(RuleEffects.MoS)
         if mos == 0:
-            eff = Effect(name=RuleEffects.Miss, source="Agile", value=Decimal(1))
-            state = state.remove_effects(name=RuleEffects.Hit).add_effect(eff)
-        return frozenset({state})
+            state = state.replace_effects(self._eff, name=RuleEffects.Hit)
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.APPLY_HIT_MISS: _agile})
 
 
 class BrawlComponent(Component):
     """Grant bonus dice on melee attacks only"""
 
+    __slots__ = ("_eff", "_value")
+
     def __init__(self, value: int) -> None:
         super().__init__()
-        self._value = Decimal(value)
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._brawl
+        self._value = value
+        self._eff = Effect(
+            name=RuleEffects.ModDice, source="Model Brawl", value=self._value
+        )
 
-    def _brawl(self, state: State) -> FrozenSet[State]:
-        if not state.get_effects(name=AttackMethods.Melee):
-            return frozenset({state})
+    def _brawl(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
 
-        eff = Effect(name=RuleEffects.ModDice, source="Model Brawl", value=self._value)
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _brawl})
+    _REQUIREMENTS = MappingProxyType({RollTimeSteps.GATHER_DICE: AttackMethods.Melee})
 
 
 class CoverComponent(Component):
     """Grant cover effect and apply cover dice to defender."""
 
+    __slots__ = ("_amount", "_cover_eff", "_dice_eff")
+
     def __init__(self, amount: CoverAmount) -> None:
         super().__init__()
         self._amount = amount
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._init_cover
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._cover
+        self._cover_eff = Effect(name=self._amount, source="Cover")
+        self._dice_eff = Effect(name=RuleEffects.ModDice, source="Cover", value=1)
 
     def _init_cover(self, state: State):
-        eff = Effect(name=self._amount, source="Cover")
-        return frozenset({state.add_effect(effect=eff)})
+        return (state.add_effect(effect=self._cover_eff),)
+
+    def _cover(self, state: State) -> Collection[State]:
+        if state.has(CoverAmount.Partial) or state.has(CoverAmount.Full):
+            state = state.add_effect(self._dice_eff)
 
-    def _cover(self, state: State) -> FrozenSet[State]:
-        eff = None
-        if state.get_effects(name=CoverAmount.Partial) or state.get_effects(
-            name=CoverAmount.Full
-        ):
-            eff = Effect(name=RuleEffects.ModDice, source="Cover", value=1)
+        return (state,)
 
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _init_cover,
+            RollTimeSteps.GATHER_DICE: _cover,
+        }
+    )
 
 
 class FacingComponent(Component):
     """Grant bonus dice for Defender facing. The Attacker model holds this."""
 
+    __slots__ = ("_eff", "_facing", "_vehicle_eff")
+
     def __init__(self, facing: Facings) -> None:
         super().__init__()
         self._facing = facing
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._facing_dice
+        source = f"Facing {self._facing.name}"
+        self._eff = Effect(name=RuleEffects.ModDice, source=source, value=1)
+        self._vehicle_eff = Effect(name=RuleEffects.ModDice, source=source, value=2)
 
-    def _facing_dice(self, state: State) -> FrozenSet[State]:
+    def _facing_dice(self, state: State) -> Collection[State]:
         """No facing bonus for Infantry, 2d6 for Vehicle, 1d6 otherwise"""
-        if self._facing != Facings.Rear or state.get_effects(name=ModelTypes.Infantry):
-            return frozenset({state})
+        if self._facing is not Facings.Rear or state.has(ModelTypes.Infantry):
+            return (state,)
 
-        if state.get_effects(name=ModelTypes.Vehicle):
-            bonus = Decimal(2)
-        else:
-            bonus = Decimal(1)
-        eff = Effect(
-            name=RuleEffects.ModDice, source=f"Facing {self._facing.name}", value=bonus
-        )
-        return frozenset({state.add_effect(eff)})
+        if state.has(ModelTypes.Vehicle):
+            return (state.add_effect(self._vehicle_eff),)
+        return (state.add_effect(self._eff),)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _facing_dice})
 
 
 class ElevatedVTOLComponent(Component):
     """Grant elevation bonus to Attacker and flag Defender as Aircraft. Attacker type
     doesn't matter in current rules."""
 
+    __slots__ = ("_air_type", "_elevated_eff")
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._set_type
-        self._behaviors[ResolveTimeSteps.GATHER_MODEL_DATA] = self._set_type
-        self._behaviors[RollTimeSteps.GATHER_THRESHOLD_BONUSES] = self._add_elevated
+        self._air_type = Effect(name=ModelTypes.Aircraft, source="Elevated VTOL")
+        self._elevated_eff = Effect(
+            name=RuleEffects.ModThreshold, source="Elevated VTOL", value=-1
+        )
 
-    def _set_type(self, state: State) -> FrozenSet(State):
+    def _set_type(self, state: State) -> Collection[State]:
         """Flag defender type as aircraft in addition to existing type."""
-        if self._parent._role == Roles.Defender:
-            air_type = Effect(name=ModelTypes.Aircraft, source="Elevated VTOL")
-            return frozenset({state.add_effect(effect=air_type)})
+        if self._parent._role is Roles.Defender:
+            return (state.add_effect(effect=self._air_type),)
         else:
-            return frozenset({state})
+            return (state,)
 
-    def _add_elevated(self, state: State) -> FrozenSet(State):
+    def _add_elevated(self, state: State) -> Collection[State]:
         """Flag attacker as Elevated."""
-        if self._parent._role == Roles.Attacker:
-            eff = Effect(
-                name=RuleEffects.ModThreshold, source="Elevated VTOL", value=-1
-            )
-            return frozenset({state.add_effect(eff)})
+        if self._parent._role is Roles.Attacker:
+            return (state.add_effect(self._elevated_eff),)
         else:
-            return frozenset({state})
+            return (state,)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _set_type,
+            ResolveTimeSteps.GATHER_MODEL_DATA: _set_type,
+            RollTimeSteps.GATHER_THRESHOLD_BONUSES: _add_elevated,
+        }
+    )
 
 
 class FieldArmorComponent(Component):
     """Reduce damage from AP first, then base damage. Minimum 1 damage remains."""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.MOD_ATTACK_DAMAGE] = self._reduce_damage
+    __slots__ = ()
 
-    def _reduce_damage(self, state: State) -> FrozenSet[State]:
+    def _reduce_damage(self, state: State) -> Collection[State]:
         """Reduce damage by 1, to a minimum of 1.
         Reduce AP first for analysis purposes."""
-        if state.get_effects(name=RuleEffects.Miss):
-            return frozenset({state})
-
-        ap_damage = state.sum_effects(
-            name=AttackEffects.AttackDamage,
-            source="AP",
-        )
-        attack_damage = state.sum_by_filter(
-            lambda e: e.name == AttackEffects.AttackDamage and e.source != "AP"
-        )
+        missed, ap_damage, attack_damage = damage_snapshot(state)
+        if missed:
+            return (state,)
 
         if attack_damage + ap_damage <= 1:
-            return frozenset({state})
+            return (state,)
 
-        eff = Effect(
-            name=AnalysisEffects.DamageDenied, source="Field Armor", value=Decimal(1)
-        )
+        eff = Effect(name=AnalysisEffects.DamageDenied, source="Field Armor", value=1)
         state = state.add_effect(eff)
 
         if ap_damage:
-            state = state.remove_effects(name=AttackEffects.AttackDamage, source="AP")
+            new_ap = None
             if ap_damage > 1:
-                new_ap = Effect(
+                new_ap = make_effect(
                     name=AttackEffects.AttackDamage,
                     source="AP",
-                    value=Decimal(ap_damage - 1),
+                    value=ap_damage - 1,
                 )
-                state = state.add_effect(new_ap)
-        else:
-            state = state.remove_effects(
-                name=AttackEffects.AttackDamage, source="Base Rules"
+            state = state.replace_effects(
+                new_ap, name=AttackEffects.AttackDamage, source="AP"
             )
-            new_attack = Effect(
+        else:
+            new_attack = make_effect(
                 name=AttackEffects.AttackDamage,
                 source="Base Rules",
-                value=Decimal(attack_damage - 1),
+                value=attack_damage - 1,
+            )
+            state = state.replace_effects(
+                new_attack, name=AttackEffects.AttackDamage, source="Base Rules"
             )
-            state = state.add_effect(new_attack)
-        return frozenset({state})
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.MOD_ATTACK_DAMAGE: _reduce_damage})
 
 
 class InfantryComponent(Component):
     """Set model type as Infantry, apply extra cover bonus, and cap non-AI damage."""
 
+    __slots__ = ("_cover_eff", "_type_eff")
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._set_type
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._infantry_cover
-        self._behaviors[ResolveTimeSteps.GATHER_MODEL_DATA] = self._set_type
-        self._behaviors[ResolveTimeSteps.CALC_ATTACK_DAMAGE] = self._cap_damage
+        self._type_eff = Effect(name=ModelTypes.Infantry, source="Type")
+        self._cover_eff = Effect(
+            name=RuleEffects.ModDice, source="Infantry Cover", value=1
+        )
 
-    def _set_type(self, state: State) -> FrozenSet(State):
+    def _set_type(self, state: State) -> Collection[State]:
         """Flag model type as Infantry"""
-        eff = Effect(name=ModelTypes.Infantry, source="Type")
-        return frozenset({state.add_effect(effect=eff)})
+        return (state.add_effect(effect=self._type_eff),)
 
-    def _infantry_cover(self, state: State) -> FrozenSet(State):
+    def _infantry_cover(self, state: State) -> Collection[State]:
         """Add 1d6 to cover bonus for Infantry"""
-        if state.get_by_filter(
-            lambda e: e.name in (CoverAmount.Partial, CoverAmount.Full)
-        ):
-            eff = Effect(
-                name=RuleEffects.ModDice, source="Infantry Cover", value=Decimal(1)
-            )
-            state = state.add_effect(eff)
-        return frozenset({state})
+        if state.has(CoverAmount.Partial) or state.has(CoverAmount.Full):
+            state = state.add_effect(self._cover_eff)
+        return (state,)
 
-    def _cap_damage(self, state: State) -> FrozenSet(State):
+    def _cap_damage(self, state: State) -> Collection[State]:
         """Cap attack damage at 2 against non-AI weapons.
         Reduce AP first for analysis purposes."""
-        if state.get_effects(name=RuleEffects.Miss) or state.get_effects(
-            name=AttackEffects.AntiInfantry
-        ):
-            return frozenset({state})
-
-        attack_damage = state.sum_effects(
-            name=AttackEffects.AttackDamage,
-            source="Base Rules",
-        )
-        ap_damage = state.sum_effects(
-            name=AttackEffects.AttackDamage,
-            source="AP",
-        )
+        # Only base and AP damage exist yet at CALC_ATTACK_DAMAGE
+        missed, ap_damage, attack_damage = damage_snapshot(state)
+        if missed or state.has(AttackEffects.AntiInfantry):
+            return (state,)
 
-        drop = Decimal(attack_damage + ap_damage - 2)
+        drop = attack_damage + ap_damage - 2
 
         if drop <= 0:
-            return frozenset({state})
+            return (state,)
 
         eff = Effect(name=AnalysisEffects.DamageDenied, source="Infantry", value=drop)
         state = state.add_effect(eff)
@@ -245,454 +244,463 @@ class InfantryComponent(Component):
         drop -= ap_drop
 
         if ap_drop:
-            state = state.remove_effects(name=AttackEffects.AttackDamage, source="AP")
+            new_ap = None
             if ap_damage - ap_drop:
-                new_ap = Effect(
+                new_ap = make_effect(
                     name=AttackEffects.AttackDamage,
                     source="AP",
                     value=ap_damage - ap_drop,
                 )
-                state = state.add_effect(new_ap)
-        if drop:
-            state = state.remove_effects(
-                name=AttackEffects.AttackDamage, source="Base Rules"
+            state = state.replace_effects(
+                new_ap, name=AttackEffects.AttackDamage, source="AP"
             )
-            new_attack = Effect(
+        if drop:
+            new_attack = make_effect(
                 name=AttackEffects.AttackDamage,
                 source="Base Rules",
                 value=attack_damage - drop,
             )
-            state = state.add_effect(new_attack)
-        return frozenset({state})
+            state = state.replace_effects(
+                new_attack, name=AttackEffects.AttackDamage, source="Base Rules"
+            )
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _set_type,
+            RollTimeSteps.GATHER_DICE: _infantry_cover,
+            ResolveTimeSteps.GATHER_MODEL_DATA: _set_type,
+            ResolveTimeSteps.CALC_ATTACK_DAMAGE: _cap_damage,
+        }
+    )
 
 
 class LumberingComponent(Component):
     """Cancel Top Speed defense bonus from Defender."""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._lumbering
+        self._eff = Effect(name=RuleEffects.ModDice, source="Lumbering", value=-1)
 
-    def _lumbering(self, state: State) -> FrozenSet(State):
+    def _lumbering(self, state: State) -> Collection[State]:
         """Cancel top speed bonus to defense"""
         top_defender = state.get_effects(name=Speed.Top, source=Roles.Defender)
         if top_defender:
-            eff = Effect(
-                name=RuleEffects.ModDice, source="Lumbering", value=Decimal(-1)
-            )
-            state = state.add_effect(eff)
+            state = state.add_effect(self._eff)
+
+        return (state,)
 
-        return frozenset({state})
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _lumbering})
+    _REQUIREMENTS = MappingProxyType({RollTimeSteps.GATHER_DICE: Speed.Top})
 
 
 class RerollComponent(Component):
     """Flag reroll condition for resolution logic."""
 
+    __slots__ = ("_eff", "_rule")
+
     def __init__(self, rule: RerollRules) -> None:
         super().__init__()
         self._rule = rule
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._reroll
+        self._eff = Effect(name=self._rule, source="Reroll")
 
-    def _reroll(self, state: State) -> FrozenSet[State]:
-        eff = Effect(name=self._rule, source="Reroll")
-        return frozenset({state.add_effect(eff)})
+    def _reroll(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
 
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _reroll})
 
-class ResistCorrosionComponent(Component):
-    """Prevent all corrosion damage and flag the average 0.5 damage prevented."""
 
-    def __init__(self) -> None:
+class ResistStatusComponent(Component):
+    """Prevent all damage from a status effect and flag the average damage prevented,
+    0.5 by default."""
+
+    __slots__ = ("_eff", "_status")
+
+    def __init__(self, status: StatusEffects, source: str, value: float = 0.5) -> None:
         super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._resist
+        self._status = status
+        self._eff = Effect(
+            name=AnalysisEffects.DamageDenied, source=source, value=value
+        )
 
-    def _resist(self, state: State) -> FrozenSet[State]:
+    def _resist(self, state: State) -> Collection[State]:
         """Remove pending damage effect before it can be rolled"""
-        if not state.get_effects(name=StatusEffects.CorrosionDamage):
-            return frozenset({state})
+        if not state.has(self._status):
+            return (state,)
+        return (state.replace_effects(self._eff, name=self._status),)
+
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.ADD_EXTRA_EFFECTS: _resist})
 
-        state = state.remove_effects(name=StatusEffects.CorrosionDamage)
-        eff = Effect(
-            name=AnalysisEffects.DamageDenied, source="Resist Corrosion", value=0.5
-        )
 
-        return frozenset({state.add_effect(eff)})
+@lru_cache(maxsize=None)
+def _fire_expected(fire: int, health: int) -> float:
+    """Expected Fire damage actually dealt to a model with [health] remaining"""
+    fire_probs = threshold_probs(dice=fire, sides=6, val=4)
+    return sum(prob * min(dmg, health) for dmg, prob in fire_probs)
 
 
 class ResistFireComponent(Component):
     """Prevent all fire damage and flag the average damage prevented."""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._resist
+    __slots__ = ()
 
-    def _resist(self, state: State) -> FrozenSet[State]:
+    def _resist(self, state: State) -> Collection[State]:
         """Remove pending damage effect before it can be rolled"""
-        if not state.get_effects(name=StatusEffects.FireDamage):
-            return frozenset({state})
-
-        health = state.sum_effects(name=RuleEffects.Hull) + state.sum_effects(
-            name=RuleEffects.Structure
-        )
-        fire = state.sum_effects(name=StatusEffects.FireDamage)
-        fire_probs = all_probs_threshold(dice=int(fire), sides=6, val=4)
-        avg_damage = sum(
-            Decimal(prob) * min(Decimal(dmg), health)
-            for dmg, prob in fire_probs.items()
-        )
-        state = state.remove_effects(name=StatusEffects.FireDamage)
+        health = state.sum(RuleEffects.Hull) + state.sum(RuleEffects.Structure)
+        fire = state.sum(StatusEffects.FireDamage)
+        avg_damage = _fire_expected(int(fire), health)
         eff = Effect(
             name=AnalysisEffects.DamageDenied, source="Resist Fire", value=avg_damage
         )
 
-        return frozenset({state.add_effect(eff)})
-
-
-class ResistHaywireComponent(Component):
-    """Prevent all haywire damage and flag the average 0.5 damage prevented."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._resist
-
-    def _resist(self, state: State) -> FrozenSet[State]:
-        """Remove pending damage effect before it can be rolled"""
-        if not state.get_effects(name=StatusEffects.HaywireDamage):
-            return frozenset({state})
-
-        state = state.remove_effects(name=StatusEffects.HaywireDamage)
-        eff = Effect(
-            name=AnalysisEffects.DamageDenied, source="Resist Haywire", value=0.5
-        )
+        return (state.replace_effects(eff, name=StatusEffects.FireDamage),)
 
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.ADD_EXTRA_EFFECTS: _resist})
+    _REQUIREMENTS = MappingProxyType(
+        {ResolveTimeSteps.ADD_EXTRA_EFFECTS: StatusEffects.FireDamage}
+    )
 
 
 class SpeedComponent(Component):
     """Apply speed mods to Attacker or Defender rolls appropriately"""
 
+    __slots__ = ("_mod_eff", "_model", "_speed")
+
+    # Dice mods by model role and speed. Combinations not listed have no mod.
+    _SPEED_MODS: Dict[Tuple[Roles, Speed], int] = {
+        (Roles.Attacker, Speed.Top): -1,
+        (Roles.Attacker, Speed.Immobilized): -1,
+        (Roles.Attacker, Speed.Braced): 1,
+        (Roles.Defender, Speed.Braced): -1,
+        (Roles.Defender, Speed.Immobilized): -1,
+        (Roles.Defender, Speed.Top): 1,
+    }
+
     def __init__(self, speed: Speed) -> None:
         super().__init__()
         self._speed: Speed = speed
         self._model: Roles = None
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._set_speed
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._speed_mod
+        self._mod_eff: Effect = None
 
     def _set_speed(self, state: State):
         self._model = self._parent._role
+        mod = self._SPEED_MODS.get((self._model, self._speed))
+        if mod is not None:
+            self._mod_eff = Effect(
+                name=RuleEffects.ModDice,
+                source=self._model.name + " " + self._speed.name + " Speed",
+                value=mod,
+            )
         eff = Effect(name=self._speed, source=self._model)
-        return frozenset({state.add_effect(effect=eff)})
+        return (state.add_effect(effect=eff),)
 
     def _speed_mod(self, state: State):
-        if self._model == Roles.Attacker:
-            if self._speed in {Speed.Top, Speed.Immobilized}:
-                mod = Decimal(-1)
-            elif self._speed == Speed.Braced:
-                mod = Decimal(1)
-            else:
-                return frozenset({state})
-        elif self._model == Roles.Defender:
-            if self._speed in {Speed.Braced, Speed.Immobilized}:
-                mod = Decimal(-1)
-            elif self._speed == Speed.Top:
-                mod = Decimal(1)
-            else:
-                return frozenset({state})
-        eff = Effect(
-            name=RuleEffects.ModDice,
-            source=self._model.name + " " + self._speed.name + " Speed",
-            value=mod,
-        )
-        return frozenset({state.add_effect(eff)})
+        # add_effect() leaves the State alone if there's no mod for this speed
+        return (state.add_effect(self._mod_eff),)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _set_speed,
+            RollTimeSteps.GATHER_DICE: _speed_mod,
+        }
+    )
 
 
 class SkillComponent(Component):
     """Calculate skill bonus to roll result."""
 
+    __slots__ = ("_skill_eff", "_threshold_eff", "_value")
+
     # activates on GATHER_RESULT_BONUSES
     # returns multiple states for different possible skill bonuses
     def __init__(self, value: int) -> None:
         super().__init__()
         self._value = value
-        self._behaviors[DebugMsg.GetSkill] = self._pass_skill
-        self._behaviors[RollTimeSteps.GATHER_THRESHOLD_BONUSES] = self._set_threshold
-        self._behaviors[RollTimeSteps.ADD_SKILL] = self._add_skill_bonus
+        self._skill_eff = Effect(name=DebugMsg.GetSkill, source="Skill", value=value)
+        self._threshold_eff = Effect(
+            name=RuleEffects.ModThreshold, source="Skill", value=value
+        )
 
-    def _pass_skill(self, state: State) -> FrozenSet[State]:
-        eff = Effect(name=DebugMsg.GetSkill, source="Skill", value=self._value)
-        return frozenset({state.add_effect(eff)})
+    def _pass_skill(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._skill_eff),)
 
-    def _set_threshold(self, state: State) -> FrozenSet[State]:
-        eff = Effect(name=RuleEffects.ModThreshold, source="Skill", value=self._value)
-        return frozenset({state.add_effect(eff)})
+    def _set_threshold(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._threshold_eff),)
 
-    def _add_skill_bonus(self: SkillComponent, state: State) -> FrozenSet[State]:
-        dice = state.sum_effects(name=RuleEffects.ModDice) - 1
-        result_die = state.sum_effects(name=RuleEffects.ModResult, source="Result Die")
-        threshold = state.sum_effects(name=RuleEffects.ModThreshold)
+    def _add_skill_bonus(self: SkillComponent, state: State) -> Collection[State]:
+        dice = state.sum(RuleEffects.ModDice) - 1
+        result_die = state.sum(RuleEffects.ModResult, "Result Die")
+        threshold = state.sum(RuleEffects.ModThreshold)
 
         # sides = result_die because max roll is the result die by definition.
         # Because the extra dice are undetermined yet, their probabilities are evenly
         # distributed among the remaining possible face values. It's a Monty Hall thing.
-        skill_probs = all_probs_threshold(
+        skill_probs = threshold_probs(
             dice=int(dice), sides=int(result_die), val=int(threshold)
         )
 
-        results = set()
-        for val, prob in skill_probs.items():
-            eff = Effect(name=RuleEffects.ModResult, source="Skill", value=Decimal(val))
-            results.add(replace(state, prob=Decimal(prob) * state.prob).add_effect(eff))
-        return frozenset(results)
+        # Each outcome adds a different skill bonus, so the new States are all distinct
+        # and don't need deduplicating in a set.
+        return tuple(
+            state.evolve(
+                add=(
+                    make_effect(name=RuleEffects.ModResult, source="Skill", value=val),
+                ),
+                prob=prob * state.prob,
+            )
+            for val, prob in skill_probs
+        )
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            DebugMsg.GetSkill: _pass_skill,
+            RollTimeSteps.GATHER_THRESHOLD_BONUSES: _set_threshold,
+            RollTimeSteps.ADD_SKILL: _add_skill_bonus,
+        }
+    )
 
 
 class StableComponent(Component):
     """Gain the Stationary bonus at Combat or Top speed"""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._stable
+        self._eff = Effect(name=RuleEffects.ModDice, source="Stable", value=1)
 
-    def _stable(self, state: State) -> FrozenSet(State):
+    def _stable(self, state: State) -> Collection[State]:
         can_stable = bool(
             state.get_effects(name=Speed.Combat, source=Roles.Attacker)
             or state.get_effects(name=Speed.Top, source=Roles.Attacker)
         )
         if can_stable:
-            eff = Effect(name=RuleEffects.ModDice, source="Stable", value=Decimal(1))
-            state = state.add_effect(eff)
-        return frozenset({state})
+            state = state.add_effect(self._eff)
+        return (state,)
 
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _stable})
 
-class VulnCorrosionComponent(Component):
-    """Always take corrosion damage without rolling"""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._take_damage
-
-    def _take_damage(self, state: State) -> FrozenSet[State]:
-        """Take pending damage before it can be rolled"""
-        eff = Effect(
-            name=AttackEffects.BonusDamage,
-            source="Corrosion",
-            value=state.sum_effects(name=StatusEffects.CorrosionDamage),
-        )
-        state = state.add_effect(eff)
-        state = apply_damage(
-            state=state,
-            filter={"name": eff.name, "source": eff.source},
-        )
-        return frozenset({state.remove_effects(name=StatusEffects.CorrosionDamage)})
 
+class VulnStatusComponent(Component):
+    """Always take damage from a status effect without rolling"""
 
-class VulnFireComponent(Component):
-    """Always take fire damage without rolling"""
+    __slots__ = ("_source", "_status")
 
-    def __init__(self) -> None:
+    def __init__(self, status: StatusEffects, source: str) -> None:
         super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._take_damage
+        self._status = status
+        self._source = source
 
-    def _take_damage(self, state: State) -> FrozenSet[State]:
+    def _take_damage(self, state: State) -> Collection[State]:
         """Take pending damage before it can be rolled"""
         eff = Effect(
             name=AttackEffects.BonusDamage,
-            source="Fire",
-            value=state.sum_effects(name=StatusEffects.FireDamage),
+            source=self._source,
+            value=state.sum(self._status),
         )
         state = state.add_effect(eff)
         state = apply_damage(
             state=state,
             filter={"name": eff.name, "source": eff.source},
         )
-        return frozenset({state.remove_effects(name=StatusEffects.FireDamage)})
+        return (state.remove_effects(name=self._status),)
 
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.ADD_EXTRA_EFFECTS: _take_damage})
 
-class VulnHaywireComponent(Component):
-    """Always take haywire damage without rolling"""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._take_damage
-
-    def _take_damage(self, state: State) -> FrozenSet[State]:
-        """Take pending damage before it can be rolled"""
-        eff = Effect(
-            name=AttackEffects.BonusDamage,
-            source="Haywire",
-            value=state.sum_effects(name=StatusEffects.HaywireDamage),
-        )
-        state = state.add_effect(eff)
-        state = apply_damage(
-            state=state,
-            filter={"name": eff.name, "source": eff.source},
-        )
-        return frozenset({state.remove_effects(name=StatusEffects.HaywireDamage)})
-
-
-MODEL_TRAIT_DEFS = {
-    "Agile": Trait(
-        partial(AgileComponent),
-        valid_role=["def"],
-    ),
-    "Aircraft": Trait(
-        partial(BasicTraitComponent, effect_name=ModelTypes.Aircraft, source="Type"),
-        valid_role=[],
-    ),
-    "ANN": Trait(
-        partial(ThresholdBonusComponent, source="ANN", value=-1),
-    ),
-    "Gear": Trait(
-        partial(BasicTraitComponent, effect_name=ModelTypes.Gear, source="Type"),
-        valid_role=[],
-    ),
-    "Brawl": Trait(
-        partial(BrawlComponent),
-        required_params=["value"],
-    ),
-    "Crippled": Trait(
-        partial(DiceBonusComponent, source="Crippled", value=-1),
-        valid_role=[],
-    ),
-    "CustomDice": Trait(
-        partial(DiceBonusComponent, source="Custom"),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "CustomResult": Trait(
-        partial(ResultBonusComponent, source="Custom"),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "CustomThreshold": Trait(
-        partial(ThresholdBonusComponent, source="Custom"),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "ECMDefense": Trait(
-        partial(DiceBonusComponent, source="ECM Defense", value=1),
-        valid_role=[],
-    ),
-    "Armor": Trait(
-        partial(BasicTraitComponent, effect_name=RuleEffects.Armor, source="Armor"),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "Skill": Trait(
-        partial(SkillComponent),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "Hull": Trait(
-        partial(BasicTraitComponent, effect_name=RuleEffects.Hull, source="Hull"),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "Reroll": Trait(
-        partial(RerollComponent),
-        required_params=["rule"],
-        valid_role=[],
-    ),
-    "Structure": Trait(
-        partial(
-            BasicTraitComponent, effect_name=RuleEffects.Structure, source="Structure"
-        ),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "Elevated": Trait(
-        partial(ThresholdBonusComponent, source="Elevation", value=-1),
-        valid_role=["att"],
-    ),
-    "ElevatedVTOL": Trait(
-        partial(ElevatedVTOLComponent),
-        excludes=["Elevated"],
-    ),
-    "Facing": Trait(
-        partial(FacingComponent),
-        required_params=["facing"],
-        valid_role=[],
-    ),
-    "FieldArmor": Trait(
-        partial(FieldArmorComponent),
-        valid_role=["def"],
-    ),
-    "FireMission": Trait(
-        partial(
-            BasicTraitComponent,
-            effect_name=AttackEffects.FireMission,
-            source="Fire Mission",
-        ),
-        valid_role=[],
-    ),
-    "Infantry": Trait(
-        partial(InfantryComponent),
-        valid_role=[],
-    ),
-    "Cover": Trait(
-        partial(CoverComponent),
-        required_params=["amount"],
-        valid_role=[],
-    ),
-    "Smoke": Trait(
-        partial(DiceBonusComponent, source="Smoke", value=1),
-        valid_role=[],
-    ),
-    "Stable": Trait(
-        partial(StableComponent),
-        valid_role=["att"],
-    ),
-    "Speed": Trait(
-        partial(SpeedComponent),
-        required_params=["speed"],
-        valid_role=[],
-    ),
-    "Lumbering": Trait(
-        partial(LumberingComponent),
-        valid_role=["def"],
-    ),
-    "ResistCorrosion": Trait(
-        partial(ResistCorrosionComponent),
-        valid_role=["def"],
-        excludes=["VulnCorrosion"],
-    ),
-    "ResistFire": Trait(
-        partial(ResistFireComponent),
-        valid_role=["def"],
-        excludes=["VulnFire"],
-    ),
-    "ResistHaywire": Trait(
-        partial(ResistHaywireComponent),
-        valid_role=["def"],
-        excludes=["VulnHaywire"],
-    ),
-    "Vehicle": Trait(
-        partial(BasicTraitComponent, effect_name=ModelTypes.Vehicle, source="Type"),
-        valid_role=[],
-    ),
-    "VulnCorrosion": Trait(
-        partial(VulnCorrosionComponent),
-        valid_role=["def"],
-        excludes=["ResistCorrosion"],
-    ),
-    "VulnFire": Trait(
-        partial(VulnFireComponent),
-        valid_role=["def"],
-        excludes=["ResistFire"],
-    ),
-    "VulnHaywire": Trait(
-        partial(VulnHaywireComponent),
-        valid_role=["def"],
-        excludes=["ResistHaywire"],
-    ),
-}
+# Wrapped in a read-only view so trait definitions can't be altered at runtime
+MODEL_TRAIT_DEFS = MappingProxyType(
+    {
+        "Agile": Trait(
+            AgileComponent,
+            valid_role=["def"],
+        ),
+        "Aircraft": Trait(
+            partial(
+                BasicTraitComponent, effect_name=ModelTypes.Aircraft, source="Type"
+            ),
+            valid_role=[],
+        ),
+        "ANN": Trait(
+            partial(ThresholdBonusComponent, source="ANN", value=-1),
+        ),
+        "Gear": Trait(
+            partial(BasicTraitComponent, effect_name=ModelTypes.Gear, source="Type"),
+            valid_role=[],
+        ),
+        "Brawl": Trait(
+            BrawlComponent,
+            required_params=["value"],
+        ),
+        "Crippled": Trait(
+            partial(DiceBonusComponent, source="Crippled", value=-1),
+            valid_role=[],
+        ),
+        "CustomDice": Trait(
+            partial(DiceBonusComponent, source="Custom"),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "CustomResult": Trait(
+            partial(ResultBonusComponent, source="Custom"),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "CustomThreshold": Trait(
+            partial(ThresholdBonusComponent, source="Custom"),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "ECMDefense": Trait(
+            partial(DiceBonusComponent, source="ECM Defense", value=1),
+            valid_role=[],
+        ),
+        "Armor": Trait(
+            partial(BasicTraitComponent, effect_name=RuleEffects.Armor, source="Armor"),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "Skill": Trait(
+            SkillComponent,
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "Hull": Trait(
+            partial(BasicTraitComponent, effect_name=RuleEffects.Hull, source="Hull"),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "Reroll": Trait(
+            RerollComponent,
+            required_params=["rule"],
+            valid_role=[],
+        ),
+        "Structure": Trait(
+            partial(
+                BasicTraitComponent,
+                effect_name=RuleEffects.Structure,
+                source="Structure",
+            ),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "Elevated": Trait(
+            partial(ThresholdBonusComponent, source="Elevation", value=-1),
+            valid_role=["att"],
+        ),
+        "ElevatedVTOL": Trait(
+            ElevatedVTOLComponent,
+            excludes=["Elevated"],
+        ),
+        "Facing": Trait(
+            FacingComponent,
+            required_params=["facing"],
+            valid_role=[],
+        ),
+        "FieldArmor": Trait(
+            FieldArmorComponent,
+            valid_role=["def"],
+        ),
+        "FireMission": Trait(
+            partial(
+                BasicTraitComponent,
+                effect_name=AttackEffects.FireMission,
+                source="Fire Mission",
+            ),
+            valid_role=[],
+        ),
+        "Infantry": Trait(
+            InfantryComponent,
+            valid_role=[],
+        ),
+        "Cover": Trait(
+            CoverComponent,
+            required_params=["amount"],
+            valid_role=[],
+        ),
+        "Smoke": Trait(
+            partial(DiceBonusComponent, source="Smoke", value=1),
+            valid_role=[],
+        ),
+        "Stable": Trait(
+            StableComponent,
+            valid_role=["att"],
+        ),
+        "Speed": Trait(
+            SpeedComponent,
+            required_params=["speed"],
+            valid_role=[],
+        ),
+        "Lumbering": Trait(
+            LumberingComponent,
+            valid_role=["def"],
+        ),
+        "ResistCorrosion": Trait(
+            partial(
+                ResistStatusComponent,
+                status=StatusEffects.CorrosionDamage,
+                source="Resist Corrosion",
+            ),
+            valid_role=["def"],
+            excludes=["VulnCorrosion"],
+        ),
+        "ResistFire": Trait(
+            ResistFireComponent,
+            valid_role=["def"],
+            excludes=["VulnFire"],
+        ),
+        "ResistHaywire": Trait(
+            partial(
+                ResistStatusComponent,
+                status=StatusEffects.HaywireDamage,
+                source="Resist Haywire",
+            ),
+            valid_role=["def"],
+            excludes=["VulnHaywire"],
+        ),
+        "Vehicle": Trait(
+            partial(BasicTraitComponent, effect_name=ModelTypes.Vehicle, source="Type"),
+            valid_role=[],
+        ),
+        "VulnCorrosion": Trait(
+            partial(
+                VulnStatusComponent,
+                status=StatusEffects.CorrosionDamage,
+                source="Corrosion",
+            ),
+            valid_role=["def"],
+            excludes=["ResistCorrosion"],
+        ),
+        "VulnFire": Trait(
+            partial(
+                VulnStatusComponent, status=StatusEffects.FireDamage, source="Fire"
+            ),
+            valid_role=["def"],
+            excludes=["ResistFire"],
+        ),
+        "VulnHaywire": Trait(
+            partial(
+                VulnStatusComponent,
+                status=StatusEffects.HaywireDamage,
+                source="Haywire",
+            ),
+            valid_role=["def"],
+            excludes=["ResistHaywire"],
+        ),
+    }
+)
 
 
 def model_trait_to_component(name: str, **kwargs) -> Component:
     """Create a model Component from a Trait definition and additional parameters."""
 
+    trait = MODEL_TRAIT_DEFS[name]
     # Get partial call to instantiate Component from trait definition
-    trait_factory = MODEL_TRAIT_DEFS[name].factory
+    trait_factory = trait.factory
     # Identify any missing required parameters
-    missing = set(MODEL_TRAIT_DEFS[name].required_params).difference(set(kwargs.keys()))
+    missing = trait.required_params - kwargs.keys()
     if missing:
         print(f"Attempted to make {name} trait without required params: {missing}")
     # Complete call to create new Component with supplied parameters
@@ -700,8 +708,8 @@ def model_trait_to_component(name: str, **kwargs) -> Component:
 
 
 def make_model_components(
-    model_params: Sequence[Mapping[str, Union[str, Decimal]]]
-) -> frozenset(Component):
+    model_params: Sequence[Mapping[str, Union[str, int]]]
+) -> Tuple[Component]:
     """Take a sequence of Trait parameters, each consisting of a name and any number of
     additional parameters, and turn them into instantiated model Components."""
-    return frozenset(model_trait_to_component(**params) for params in model_params)
+    return tuple([model_trait_to_component(**params) for params in model_params])
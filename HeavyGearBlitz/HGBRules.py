@@ -2,20 +2,36 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass, field, replace
-from decimal import Decimal, getcontext
 from enum import Enum, auto
-from itertools import groupby, product
-from operator import attrgetter
-from typing import Any, Callable, FrozenSet, Hashable, Iterable, List, Mapping, Tuple
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Tuple,
+)
 
 from diceGame.diceProbs import all_probs_high_die, expected
-from diceGame.gameObjects import BaseEffect, Component, Entity, State
+from diceGame.gameObjects import (
+    SLOTS,
+    BaseEffect,
+    Component,
+    Entity,
+    State,
+    merge_states,
+)
 
 # Constants, Enums, etc.
-getcontext().prec = 12
 
 # Type alias for a probability distribution function
-PDF = Mapping[Decimal, Decimal]
+PDF = Mapping[float, float]
 
 # The following Enums act as names for steps of the roll resolution process or game
 # terms. They could just as easily be strings, but using Enums reduces the chance of
@@ -98,6 +114,17 @@ class ResolveTimeSteps(Enum):
     CLEANUP = auto()
 
 
+# Every Behavior in these steps leaves a missed attack unchanged, so States holding a
+# Miss can skip them entirely
+MISS_INERT_STEPS = frozenset(
+    {
+        ResolveTimeSteps.CALC_ATTACK_DAMAGE,
+        ResolveTimeSteps.MOD_ATTACK_DAMAGE,
+        ResolveTimeSteps.APPLY_ATTACK_DAMAGE,
+    }
+)
+
+
 class RuleEffects(Enum):
     ModDice = auto()
     ModResult = auto()
@@ -146,7 +173,7 @@ class DebugMsg(Enum):
     GetSkill = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **SLOTS)
 class Effect(BaseEffect):
     """The Effect class represents any piece of game state that must be tracked.
     Aside from their probability, States are differentiated by their Effects.
@@ -159,12 +186,19 @@ class Effect(BaseEffect):
 
     name: Enum
     source: str
-    value: Decimal = Decimal(1)
+    value: float = 1
 
     def __str__(self) -> str:
         return f"{self.name.name} ({self.source}): {self.value:0.2g}"
 
 
+@lru_cache(maxsize=4096)
+def make_effect(name: Enum, source: str, value: float = 1) -> Effect:
+    """Interned Effect constructor for Effects built over and over in hot loops.
+    Effects are immutable, so equal ones can safely be shared between States."""
+    return Effect(name=name, source=source, value=value)
+
+
 class HGBEntity(Entity):
     """The HGBEntity class represents an entity within the rules of Heavy Gear Blitz
     that is part of the attack resolution process, typically a model. Game rules that
@@ -183,18 +217,14 @@ class HGBEntity(Entity):
 
 
 def make_model(
-    model_components: FrozenSet(Component) = None,
-    weapon_components: FrozenSet(Component) = None,
+    model_components: Iterable[Component] = None,
+    weapon_components: Iterable[Component] = None,
     role: Roles = None,
 ) -> HGBEntity:
     """Bundle model and weapon Components, if present, and give them to a new HGBEntity
-    with a Role. Enforces uniqueness of Components by using sets."""
+    with a Role. Weapon Components are added first, then model Components."""
     model = HGBEntity(role=role)
-    if weapon_components is None:
-        weapon_components = set()
-    if model_components is None:
-        model_components = set()
-    for trait in weapon_components.union(model_components):
+    for trait in chain(weapon_components or (), model_components or ()):
         model.add_component(trait)
     return model
 
@@ -207,20 +237,34 @@ def get_rules() -> HGBEntity:
     return rules
 
 
+_HULL_OR_STRUCTURE = frozenset([RuleEffects.Hull, RuleEffects.Structure])
+
+
+def _is_hull_or_structure(effect: Effect) -> bool:
+    return effect.name in _HULL_OR_STRUCTURE
+
+
 def apply_damage(state: State, filter: Mapping[str, Any]) -> State:
     """Apply specific pending damage Effects to Hull and Structure. Filter is required
     to select which Effects to apply, because damage from different sources is applied
     at different times.
     """
-    if state.get_effects(name=StatusEffects.Destroyed):
+    effects = state.get_effects(**filter)  # Get only desired effects
+    return apply_damage_effects(state, effects)
+
+
+def apply_damage_effects(state: State, effects: Collection[Effect]) -> State:
+    """Apply already selected pending damage Effects to Hull and Structure, for
+    callers that have gathered them themselves."""
+    if not effects or state.has(StatusEffects.Destroyed):
         return state
 
-    effects = state.get_effects(**filter)  # Get only desired effects
+    # Track Hull and Structure locally and only write them back once at the end
+    hull = state.sum(RuleEffects.Hull)
+    structure = state.sum(RuleEffects.Structure)
     for eff in effects:
         damage = eff.value
         source = eff.source
-        hull = state.sum_effects(name=RuleEffects.Hull)
-        structure = state.sum_effects(name=RuleEffects.Structure)
 
         hull_damage = min(damage, hull)  # Apply damage up to Hull
         hull -= hull_damage
@@ -229,37 +273,46 @@ def apply_damage(state: State, filter: Mapping[str, Any]) -> State:
         structure -= structure_damage
         damage -= structure_damage  # Remove Structure damage from total
 
-        # Replace Hull and Structure Effects reflecting damage done
-        state = state.remove_effects(name=RuleEffects.Hull).remove_effects(
-            name=RuleEffects.Structure
-        )
-        new_hull = Effect(name=RuleEffects.Hull, source="Hull", value=hull)
-        new_structure = Effect(
-            name=RuleEffects.Structure, source="Structure", value=structure
-        )
-        state = state.add_effect(new_hull).add_effect(new_structure)
-
         # Mark Destroyed and remove Crippled if needed
         if structure == 0:
-            destroyed = Effect(name=StatusEffects.Destroyed, source=source)
-            state = state.add_effect(destroyed).remove_effects(
-                name=StatusEffects.Crippled
-            )
+            destroyed = make_effect(name=StatusEffects.Destroyed, source=source)
+            state = state.replace_effects(destroyed, name=StatusEffects.Crippled)
         # Mark Crippled if needed
-        elif hull == 0 and not state.get_effects(name=StatusEffects.Crippled):
-            crippled = Effect(name=StatusEffects.Crippled, source=source)
+        elif hull == 0 and not state.has(StatusEffects.Crippled):
+            crippled = make_effect(name=StatusEffects.Crippled, source=source)
             state = state.add_effect(crippled)
 
         # Remaining damage is Overkill. Note it for analysis.
         if damage > 0:
-            overdamage = Effect(
+            overdamage = make_effect(
                 name=AnalysisEffects.Overdamage,
                 source=source,
                 value=damage,
             )
             state = state.add_effect(overdamage)
 
-    return state
+    # Replace Hull and Structure Effects reflecting all damage done
+    new_hull = make_effect(name=RuleEffects.Hull, source="Hull", value=hull)
+    new_structure = make_effect(
+        name=RuleEffects.Structure, source="Structure", value=structure
+    )
+    return state.evolve(add=(new_hull, new_structure), remove=_is_hull_or_structure)
+
+
+def damage_snapshot(state: State) -> Tuple[bool, float, float]:
+    """Gather what damage reducing rules need from a State in a single pass over its
+    Effects. Returns (missed, AP attack damage, all other attack damage)."""
+    missed = False
+    ap_damage = other_damage = 0
+    for eff in state.effects:
+        if eff.name is RuleEffects.Miss:
+            missed = True
+        elif eff.name is AttackEffects.AttackDamage:
+            if eff.source == "AP":
+                ap_damage += eff.value
+            else:
+                other_damage += eff.value
+    return missed, ap_damage, other_damage
 
 
 """Type alias for keyfunc. An EffectKey should be a function that takes a State
@@ -268,7 +321,7 @@ or State.sum_by_filter().
 
 The value returned by EffectKey() will then be used to sort or group together States in 
 a larger collection."""
-EffectKey = Callable[[State], Decimal]
+EffectKey = Callable[[State], float]
 
 
 def group_states(states: Iterable[State], key: EffectKey) -> PDF:
@@ -279,53 +332,43 @@ def group_states(states: Iterable[State], key: EffectKey) -> PDF:
         of value 1. You have a second State with a probability of 0.3 and a single
         Damage effect of value 1. If EffectKey is extracting Damage values, then
         group_states() should include an entry of {1: 0.5} showing the combined
-        probability of 0.5 to have a Damage effect with value 1."""
-    states = sorted(states, key=key)
-
-    # itertools.groupby() takes an iterable and returns an iterator that groups
-    # the elements of the input according the value returned when key() is called
-    # on each element. Suppose key() is a function that returns the total value of any
-    # Damage effects from its input State. Then groupby() might return:
-    #
-    #   [
-    #       (0, (states[1], states[3])),
-    #       (1, (states[2], states[0])),
-    #       (2, (states[4], ))
-    #   ]
-    #
-    # This is an iterable with 3 elements, and each element is a pair consisting of
-    # a key value and another iterable. The sub-iterable contains every State where
-    # key(State) == value.
-    #
-    # The returning dictionary comprehension takes the pairs from groupby() and turns
-    # them into dict entries in the form of:
-    #   {value : total probability of States where that value occurred}
-    #
-    # See map() and operator.attrgetter() documentation for more information.
-    return {k: sum(map(attrgetter("prob"), v)) for k, v in groupby(states, key=key)}
+        probability of 0.5 to have a Damage effect with value 1.
+
+    The returned PDF is ordered by ascending value."""
+    # Accumulate probabilities by key in a single pass over the States. Each State
+    # adds its probability to the running total for its key value, e.g. after
+    # seeing both States from the example above, totals[1] == 0.5.
+    totals = defaultdict(float)
+    for state in states:
+        totals[key(state)] += state.prob
+
+    # Only the distinct values need sorting, not every State
+    return {val: totals[val] for val in sorted(totals)}
 
 
 def effect_value_key(**kwargs) -> EffectKey:
     """This higher order function makes a key function for extracting the sum of values
     of matching effects from a State."""
 
-    def key(state: State) -> Decimal:
+    def key(state: State) -> float:
         return state.sum_effects(**kwargs)
 
     return key
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **SLOTS)
 class Trait:
     """Definition for Model and Weapon Traits in Heavy Gear Blitz. Each Trait
     corresponds to a Component that implements its rules. Some parameters of the
     Component may be unchanging, and some may be variable. Traits also define valid
     model roles, and may require or exclude other Traits according to HGB rules.
 
-    factory: Requied. Partial call to instantiate the implementing Component. Will be
-        completed later by applying supplied params to the partial call.
+    factory: Requied. Callable to instantiate the implementing Component: the
+        Component class itself, or a partial call with any fixed params bound. Will be
+        completed later by applying supplied params to the call.
     required_params: Optional. Required parameters for this Trait to complete
-        instantiating the underlying Component, most often "value".
+        instantiating the underlying Component, most often "value". Stored as a
+        frozenset so missing parameters can be found with a set difference.
     valid_role: Optional. List of valid model roles to have this Trait.
     requires: Optional. List of names of other Traits required to have this Trait.
     excludes: Optional. List of names of other Traits blocked BY this Trait, either
@@ -333,227 +376,274 @@ class Trait:
     """
 
     factory: Callable
-    required_params: List[str] = field(default_factory=list)
+    required_params: FrozenSet[str] = field(default_factory=frozenset)
     valid_role: List[str] = field(default_factory=lambda: ["att", "def"])
     requires: List[str] = field(default_factory=list)
     excludes: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Trait is frozen, so bypass the dataclass __setattr__ to convert lists
+        object.__setattr__(self, "required_params", frozenset(self.required_params))
+
+
+@lru_cache(maxsize=None)
+def roll_probs(dice: int, reroll_below_avg: bool) -> Tuple[Tuple[int, float]]:
+    """Probabilities of each high die result for a pool of d6, optionally rerolling
+    below average results. Cached, as the same few pools come up in every Scenario.
+
+    Format: ((high roll, probability of high roll), ...)"""
+    max_probs = all_probs_high_die(dice=dice, sides=6)
+
+    # Resolve rerolling below average results
+    if reroll_below_avg:
+        avg = expected(max_probs)
+        # Outcomes to reroll
+        rerolls = {roll for roll in max_probs if roll < avg}
+        # Preserve non-rerolled outcomes
+        new_probs = {
+            roll: prob for roll, prob in max_probs.items() if roll not in rerolls
+        }
+        # Zero out probability of rerolls in new set of outcomes for now.
+        new_probs.update({reroll: 0.0 for reroll in rerolls})
+
+        for reroll in rerolls:
+            for roll in max_probs:
+                # The chance of rerolling to each possible value is the SUM of each
+                # chance of rolling each original roll * the chance of rolling the
+                # new roll. Because the reroll probs are the same as the original
+                # probs, we can reuse the max_probs variable for the math.
+                new_probs[roll] = new_probs[roll] + (
+                    max_probs[reroll] * max_probs[roll]
+                )
+        max_probs = new_probs  # Finally we can alter max_probs before proceeding.
+
+    return tuple(max_probs.items())
+
 
 # Component definitions
 
 
 class DiceRuleComponent(Component):
-    # Create base two dice when gathering dice.
-    # Performs roll on ROLL_DICE, ensures minimum 1 die
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._add_two
-        self._behaviors[RollTimeSteps.ROLL_DICE] = self._roll
+    __slots__ = ()
 
-    def _add_two(self: DiceRuleComponent, state: State) -> FrozenSet[State]:
+    def _add_two(self: DiceRuleComponent, state: State) -> Collection[State]:
         """Grant the two base dice for every skill roll"""
-        eff = Effect(name=RuleEffects.ModDice, source="Base Rules", value=Decimal(2))
-        return frozenset({state.add_effect(eff)})
+        eff = make_effect(name=RuleEffects.ModDice, source="Base Rules", value=2)
+        return (state.add_effect(eff),)
 
-    def _roll(self: DiceRuleComponent, state: State) -> FrozenSet[State]:
+    def _roll(self: DiceRuleComponent, state: State) -> Collection[State]:
         """Tally dice and return multiple states for max result probs"""
-        dice = state.sum_effects(name=RuleEffects.ModDice)
+        dice = state.sum(RuleEffects.ModDice)
         dice = max(dice, 1)
-        max_probs = all_probs_high_die(dice=int(dice), sides=6)
-
-        # Resolve rerolling below average results
-        if state.get_effects(name=RerollRules.BelowAverage):
-            avg = expected(max_probs)
-            # Outcomes to reroll
-            rerolls = [roll for roll in max_probs if roll < avg]
-            # Preserve non-rerolled outcomes
-            new_probs = {
-                roll: prob for roll, prob in max_probs.items() if roll not in rerolls
-            }
-            # Zero out probability of rerolls in new set of outcomes for now.
-            new_probs.update({reroll: 0.0 for reroll in rerolls})
-
-            for reroll in rerolls:
-                for roll in max_probs:
-                    # The chance of rerolling to each possible value is the SUM of each
-                    # chance of rolling each original roll * the chance of rolling the
-                    # new roll. Because the reroll probs are the same as the original
-                    # probs, we can reuse the max_probs variable for the math.
-                    new_probs[roll] = new_probs[roll] + (
-                        max_probs[reroll] * max_probs[roll]
-                    )
-            max_probs = new_probs  # Finally we can alter max_probs before proceeding.
+        max_probs = roll_probs(int(dice), state.has(RerollRules.BelowAverage))
 
         # Create the base set of result States for each roll outcome
-        results = set()
-        for val, prob in max_probs.items():
-            eff = Effect(
-                name=RuleEffects.ModResult,
-                source="Result Die",
-                value=Decimal(val),
+        results = []
+        for val, prob in max_probs:
+            eff = make_effect(
+                name=RuleEffects.ModResult, source="Result Die", value=val
             )
-            results.add(replace(state, prob=Decimal(prob) * state.prob).add_effect(eff))
-        return frozenset(results)
+            results.append(state.evolve(add=(eff,), prob=prob * state.prob))
+        return tuple(results)
+
+    # Create base two dice when gathering dice.
+    # Performs roll on ROLL_DICE, ensures minimum 1 die
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.GATHER_DICE: _add_two,
+            RollTimeSteps.ROLL_DICE: _roll,
+        }
+    )
 
 
 class AttackRuleComponent(Component):
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.APPLY_HIT_MISS] = self._hit_miss
-        self._behaviors[ResolveTimeSteps.CALC_ATTACK_DAMAGE] = self._calc_attack_damage
-        self._behaviors[ResolveTimeSteps.MOD_ATTACK_DAMAGE] = self._marginal_hit
-        self._behaviors[
-            ResolveTimeSteps.APPLY_ATTACK_DAMAGE
-        ] = self._apply_attack_damage
-
-    def _hit_miss(self: AttackRuleComponent, state: State) -> FrozenSet[State]:
+    __slots__ = ()
+
+    def _hit_miss(self: AttackRuleComponent, state: State) -> Collection[State]:
         """Determine hit or miss based on MoS"""
-        mos = state.sum_effects(name=RuleEffects.MoS)
+        mos = state.sum(RuleEffects.MoS)
         if mos >= 0:
-            eff = Effect(name=RuleEffects.Hit, source="Base Rules", value=Decimal(1))
+            eff = make_effect(name=RuleEffects.Hit, source="Base Rules", value=1)
         else:
-            eff = Effect(name=RuleEffects.Miss, source="Base Rules", value=Decimal(1))
-        return frozenset({state.add_effect(eff)})
+            eff = make_effect(name=RuleEffects.Miss, source="Base Rules", value=1)
+        return (state.add_effect(eff),)
 
     def _calc_attack_damage(
         self: AttackRuleComponent, state: State
-    ) -> FrozenSet[State]:
+    ) -> Collection[State]:
         """Calculate attack damage and add pending marginal hit if necessary"""
-        if not state.get_effects(name=RuleEffects.Hit):
-            return frozenset({state})
-
-        damage = state.sum_effects(name=AttackEffects.WeaponDamage)
-        armor = state.sum_effects(name=RuleEffects.Armor)
-        mos = state.sum_effects(name=RuleEffects.MoS)
+        damage = state.sum(AttackEffects.WeaponDamage)
+        armor = state.sum(RuleEffects.Armor)
+        mos = state.sum(RuleEffects.MoS)
         attack_damage = damage + mos - armor
         if attack_damage == 0:
-            marginal_hit = Effect(name=AttackEffects.MarginalHit, source="Base Rules")
+            marginal_hit = make_effect(
+                name=AttackEffects.MarginalHit, source="Base Rules"
+            )
             state = state.add_effect(marginal_hit)
-        attack_damage_eff = Effect(
+        attack_damage_eff = make_effect(
             name=AttackEffects.AttackDamage,
             source="Base Rules",
-            value=Decimal(max(attack_damage, 0)),
+            value=max(attack_damage, 0),
         )
         state = state.add_effect(attack_damage_eff)
-        return frozenset({state})
+        return (state,)
 
-    def _marginal_hit(self, state: State) -> FrozenSet[State]:
+    def _marginal_hit(self, state: State) -> Collection[State]:
         """Add probabilistic marginal hit damage if not removed yet."""
-        if not state.get_effects(name=AttackEffects.MarginalHit):
-            return frozenset({state})
-
         state = state.remove_effects(name=AttackEffects.MarginalHit)
-        no_hit = replace(state, prob=state.prob * Decimal(0.5))
-        eff = Effect(
-            name=AttackEffects.AttackDamage, source="Marginal Hit", value=Decimal(1)
+        no_hit = replace(state, prob=state.prob * 0.5)
+        eff = make_effect(
+            name=AttackEffects.AttackDamage, source="Marginal Hit", value=1
         )
-        hit = replace(no_hit).add_effect(eff)
-        return frozenset({no_hit, hit})
+        hit = no_hit.evolve(add=(eff,))
+        return (no_hit, hit)
 
-    def _apply_attack_damage(self, state: State) -> FrozenSet[State]:
+    def _apply_attack_damage(self, state: State) -> Collection[State]:
         """Reduce Hull and Structure by attack damage"""
-        if state.get_effects(name=RuleEffects.Miss):
-            return frozenset({state})
+        if state.has(RuleEffects.Miss):
+            return (state,)
+
+        # Sort attack damage by source in one pass. Applying damage doesn't touch the
+        # AttackDamage Effects themselves, so the buckets stay valid throughout.
+        by_source = defaultdict(list)
+        for eff in state.by_name.get(AttackEffects.AttackDamage, ()):
+            by_source[eff.source].append(eff)
 
         # For analysis purposes, we treat AP as bonus damage above base damage.
         damage_order = ["Base Rules", "Marginal Hit", "AP"]
         for source in damage_order:
-            state = apply_damage(
-                state=state,
-                filter={"name": AttackEffects.AttackDamage, "source": source},
-            )
-
-        return frozenset({state})
+            state = apply_damage_effects(state, by_source.get(source))
+
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            ResolveTimeSteps.APPLY_HIT_MISS: _hit_miss,
+            ResolveTimeSteps.CALC_ATTACK_DAMAGE: _calc_attack_damage,
+            ResolveTimeSteps.MOD_ATTACK_DAMAGE: _marginal_hit,
+            ResolveTimeSteps.APPLY_ATTACK_DAMAGE: _apply_attack_damage,
+        }
+    )
+    _REQUIREMENTS = MappingProxyType(
+        {
+            ResolveTimeSteps.CALC_ATTACK_DAMAGE: RuleEffects.Hit,
+            ResolveTimeSteps.MOD_ATTACK_DAMAGE: AttackEffects.MarginalHit,
+        }
+    )
 
 
 class AnalysisComponent(Component):
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.CLEANUP] = self._cleanup
+    __slots__ = ()
 
-    def _cleanup(self, state: State) -> FrozenSet[State]:
+    def _cleanup(self, state: State) -> Collection[State]:
         """Cleanup Effects to smooth analysis"""
         get_all_damage = lambda eff: eff.name in (
             AttackEffects.AttackDamage,
             AttackEffects.BonusDamage,
         )
         # Unify damage effects, preserving source
-        for eff in state.get_by_filter(get_all_damage):
-            damage = eff.value
-            source = eff.source
-            state = state.add_effect(
-                Effect(
-                    name=AnalysisEffects.Damage,
-                    source=source,
-                    value=damage,
-                )
-            )
-        state = state.remove_by_filter(get_all_damage)
+        damage_effs = [
+            Effect(name=AnalysisEffects.Damage, source=eff.source, value=eff.value)
+            for eff in state.get_by_filter(get_all_damage)
+        ]
+        state = state.evolve(add=damage_effs, remove=get_all_damage)
         # TODO: Remove unneeded Effects for analysis if slow
-        return frozenset({state})
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.CLEANUP: _cleanup})
 
 
 class DiceBonusComponent(Component):
     """A generic dice bonus from whatever source. Can be negative for penalties."""
 
+    __slots__ = ("_eff", "_source", "_value")
+
     def __init__(self, source: str, value: int) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._add_dice
         self._source = source
         self._value = value
+        # A zero bonus adds nothing; add_effect() leaves the State alone for None
+        self._eff = (
+            Effect(name=RuleEffects.ModDice, source=source, value=value)
+            if value
+            else None
+        )
+
+    def _add_dice(self: DiceBonusComponent, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
 
-    def _add_dice(self: DiceBonusComponent, state: State) -> FrozenSet[State]:
-        eff = Effect(name=RuleEffects.ModDice, source=self._source, value=self._value)
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _add_dice})
 
 
 class ResultBonusComponent(Component):
     """A generic result bonus from whatever source. Can be negative for penalties."""
 
+    __slots__ = ("_eff", "_source", "_value")
+
     def __init__(self, source: str, value: int) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_RESULT_BONUSES] = self._add_result
         self._source = source
         self._value = value
+        self._eff = (
+            Effect(name=RuleEffects.ModResult, source=source, value=value)
+            if value
+            else None
+        )
 
-    def _add_result(self: ResultBonusComponent, state: State) -> FrozenSet[State]:
-        eff = Effect(name=RuleEffects.ModResult, source=self._source, value=self._value)
-        return frozenset({state.add_effect(eff)})
+    def _add_result(self: ResultBonusComponent, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_RESULT_BONUSES: _add_result})
 
 
 class ThresholdBonusComponent(Component):
     """A generic skill bonus from whatever source. Can be negative for penalties."""
 
+    __slots__ = ("_eff", "_source", "_value")
+
     def __init__(self, source: str, value: int) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_THRESHOLD_BONUSES] = self._add_threshold
         self._source = source
         self._value = value
-
-    def _add_threshold(self: ThresholdBonusComponent, state: State) -> FrozenSet[State]:
-        eff = Effect(
-            name=RuleEffects.ModThreshold, source=self._source, value=self._value
+        self._eff = (
+            Effect(name=RuleEffects.ModThreshold, source=source, value=value)
+            if value
+            else None
         )
-        return frozenset({state.add_effect(eff)})
+
+    def _add_threshold(
+        self: ThresholdBonusComponent, state: State
+    ) -> Collection[State]:
+        return (state.add_effect(self._eff),)
+
+    _BEHAVIORS = MappingProxyType(
+        {RollTimeSteps.GATHER_THRESHOLD_BONUSES: _add_threshold}
+    )
 
 
 class BasicTraitComponent(Component):
     """For setting data Effects with no extra behavior. If a Trait may trigger other
     rules but doesn't need to act on its own logic, make it an instance of this."""
 
-    def __init__(
-        self, effect_name: Enum, source: str, value: Decimal = Decimal(1)
-    ) -> None:
+    __slots__ = ("_eff", "_effect_name", "_source", "_value")
+
+    def __init__(self, effect_name: Enum, source: str, value: float = 1) -> None:
         super().__init__()
         self._effect_name = effect_name
         self._source = source
-        self._value = Decimal(value)
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._add_trait
-        self._behaviors[ResolveTimeSteps.GATHER_MODEL_DATA] = self._add_trait
+        self._value = value
+        self._eff = Effect(name=effect_name, source=source, value=value)
+
+    def _add_trait(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
 
-    def _add_trait(self, state: State) -> FrozenSet[State]:
-        eff = Effect(name=self._effect_name, source=self._source, value=self._value)
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _add_trait,
+            ResolveTimeSteps.GATHER_MODEL_DATA: _add_trait,
+        }
+    )
 
 
 # May eventually rename Scenario to Interaction and add a higher level Scenario class
@@ -575,27 +665,58 @@ class Scenario:
             base_rules = get_rules()
         self._base_rules = base_rules
         if start_states is None:
-            start_states = frozenset({State(prob=Decimal(1))})
+            start_states = frozenset({State(prob=1.0)})
         self._start_states = start_states
+        self._compiled_resolve: Tuple[Tuple[Hashable, Tuple[Component, ...]]] = None
+        self._rolls: Tuple[Tuple[State, ...], Tuple[State, ...]] = None
+
+    def compile(self) -> None:
+        """Flatten the Components acting on each resolution step into one sequence, in
+        Entity order, so evaluate() can run them directly instead of dispatching
+        through each Entity. Done automatically on the first evaluate(). Call again
+        if Components are added to the Entities afterwards."""
+        entities = (self._base_rules, self._attacker, self._defender)
+        compiled = []
+        for step in ResolveTimeSteps:
+            components = tuple(
+                chain.from_iterable(entity.components(step) for entity in entities)
+            )
+            if components:
+                compiled.append((step, components))
+        self._compiled_resolve = tuple(compiled)
 
     def pass_states(
-        self: Scenario, entity: HGBEntity, msg: Hashable, states: FrozenSet[State]
-    ) -> FrozenSet[State]:
+        self: Scenario, entity: HGBEntity, msg: Hashable, states: Collection[State]
+    ) -> Collection[State]:
         """Pass the current message and each current State to the given Entity and
         collect the resulting States. This is where the Entity's Components get a
-        chance to execute their Behaviors to modify or split a State."""
+        chance to execute their Behaviors to modify or split a State.
+
+        States are kept in plain lists between steps, and only frozen at the end of
+        get_rolls() and evaluate()."""
         if msg not in entity.valid_messages():
             return states
         results = []
-        working = list(states)
-        while working:
-            results.extend(entity.pass_message(msg=msg, state=working.pop()))
+        for state in states:
+            results.extend(entity.pass_message(msg=msg, state=state))
 
-        return frozenset(results)
+        return results
 
     def get_rolls(self) -> Tuple[FrozenSet[State], FrozenSet[State]]:
         """Run the initial time steps of the attack resolution process to get
         attacker and defender roll results."""
+        att_rolls, def_rolls = self._roll_states()
+        return (frozenset(att_rolls), frozenset(def_rolls))
+
+    def _roll_states(self) -> Tuple[Collection[State], Collection[State]]:
+        """get_rolls(), but leaving the States in the working sequences that
+        evaluate() carries on with. The rolls only depend on the Scenario's Entities,
+        so they are worked out once and shared by describe_rolls() and evaluate()."""
+        if self._rolls is None:
+            self._rolls = self._run_roll_steps()
+        return self._rolls
+
+    def _run_roll_steps(self) -> Tuple[Tuple[State, ...], Tuple[State, ...]]:
         init_steps = [
             RollTimeSteps.INITIALIZE,
             RollTimeSteps.CHECK_COVER,
@@ -633,24 +754,22 @@ class Scenario:
             def_rolls = self.pass_states(
                 entity=self._defender, msg=step, states=def_rolls
             )
-        return (att_rolls, def_rolls)
+        return (tuple(att_rolls), tuple(def_rolls))
 
     def describe_rolls(self) -> Mapping[str, str]:
         """Get skill, dice pool, result bonus, and TN for attacker/defender rolls
         in string format."""
         att_rolls, def_rolls = self.get_rolls()
         # Just get one possible roll each from Attacker and Defender.
-        for att_state in att_rolls:
-            break
-        for def_state in def_rolls:
-            break
+        att_state = next(iter(att_rolls))
+        def_state = next(iter(def_rolls))
         results = []
         # Extract skill, dice pool, result bonus, and TN for attacker and defender.
         for state in (att_state, def_state):
-            skill = state.sum_effects(name=DebugMsg.GetSkill)
-            threshold_mod = state.sum_effects(name=RuleEffects.ModThreshold)
-            dice = max(state.sum_effects(name=RuleEffects.ModDice), 1)
-            result_mod = state.sum_effects(name=RuleEffects.ModResult)
+            skill = state.sum(DebugMsg.GetSkill)
+            threshold_mod = state.sum(RuleEffects.ModThreshold)
+            dice = max(state.sum(RuleEffects.ModDice), 1)
+            result_mod = state.sum(RuleEffects.ModResult)
             results.append(
                 " ".join(
                     [
@@ -665,8 +784,7 @@ class Scenario:
 
     def evaluate(self) -> FrozenSet[State]:
         """Perform the complete attack resolution process for this scenario."""
-        att_rolls, def_rolls = self.get_rolls()
-        entities = [self._base_rules, self._attacker, self._defender]
+        att_rolls, def_rolls = self._roll_states()
 
         # Apply base rules, then model specific mods for Attacker and Defender.
         for step in [RollTimeSteps.ROLL_DICE, RollTimeSteps.ADD_SKILL]:
@@ -683,31 +801,49 @@ class Scenario:
                 entity=self._defender, msg=step, states=def_rolls
             )
 
-        # Convert pairs of roll results to MoS states
-        mos_probs = defaultdict(Decimal)
-        # Compare each possible attacker roll to each possible defender roll
-        for att_state, def_state in product(att_rolls, def_rolls):
-            att_roll = att_state.sum_effects(name=RuleEffects.ModResult)
-            def_roll = def_state.sum_effects(name=RuleEffects.ModResult)
-            mos = att_roll - def_roll
-            mos_probs[mos] = mos_probs[mos] + (att_state.prob * def_state.prob)
-
-        mos_states = set()
+        # Convert pairs of roll results to MoS states. Many roll States share a
+        # result, so collapse each side to a PDF of results first and convolve those.
+        # Each roll State's result is read exactly once here, N + M lookups in total
+        roll_key = lambda state: state.sum(RuleEffects.ModResult)
+        att_pdf = group_states(att_rolls, key=roll_key)
+        def_pdf = group_states(def_rolls, key=roll_key)
+        mos_probs = defaultdict(float)
+        # Compare each possible attacker result to each possible defender result.
+        # Plain nested loops avoid building a pair tuple for every combination.
+        def_items = tuple(def_pdf.items())
+        for att_roll, att_prob in att_pdf.items():
+            for def_roll, def_prob in def_items:
+                mos_probs[att_roll - def_roll] += att_prob * def_prob
+
+        mos_states = []
         for mos, prob in mos_probs.items():
-            eff = Effect(name=RuleEffects.MoS, source="Base Rules", value=mos)
-            mos_states.add(State(prob=prob, effects=frozenset({eff})))
-        mos_states = frozenset(mos_states)
+            eff = make_effect(name=RuleEffects.MoS, source="Base Rules", value=mos)
+            mos_states.append(State(prob=prob, effects=frozenset({eff})))
 
         # Evalute results for each unique MoS
-        for step in ResolveTimeSteps:
-            for entity in entities:  # Base rules, Attacker, then Defender
-                # Remember, mos_states is an immutable frozenset. It is recreated with
-                # or without changes during each entity's turn in each step.
-                mos_states = self.pass_states(
-                    entity=entity, msg=step, states=mos_states
-                )
-
-        return mos_states
+        if self._compiled_resolve is None:
+            self.compile()
+        missed = []
+        for step, components in self._compiled_resolve:
+            if missed and step not in MISS_INERT_STEPS:
+                mos_states.extend(missed)  # Rejoin once past the attack damage steps
+                missed = []
+            # Base rules, Attacker, then Defender Components, in that order.
+            # mos_states is rebuilt with or without changes by each Component in each
+            # step, and frozen only once resolution is finished.
+            for component in components:
+                results = []
+                for state in mos_states:
+                    results.extend(component.run(msg=step, state=state))
+                mos_states = results
+            if step is ResolveTimeSteps.APPLY_HIT_MISS:
+                # Set misses aside so they aren't dispatched through MISS_INERT_STEPS
+                missed = [s for s in mos_states if s.has(RuleEffects.Miss)]
+                mos_states = [s for s in mos_states if not s.has(RuleEffects.Miss)]
+
+        # Merge States with identical Effects so consumers see each outcome once,
+        # with its combined probability.
+        return frozenset(merge_states(chain(mos_states, missed)))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from decimal import Decimal
-from functools import partial
-from typing import FrozenSet, Mapping, Sequence, Union
+from functools import lru_cache, partial
+from types import MappingProxyType
+from typing import Any, Collection, FrozenSet, Mapping, Sequence, Tuple, Union
 
-from diceGame.diceProbs import all_probs_threshold
+from diceGame.diceProbs import threshold_probs
 from diceGame.gameObjects import Component, State
 from .HGBRules import (
     AttackEffects,
@@ -24,408 +24,423 @@ from .HGBRules import (
     StatusEffects,
     Trait,
     apply_damage,
+    make_effect,
 )
 
 
 class APComponent(Component):
     """Alternate damage calculation based on MoS against high Armor defenders"""
 
+    __slots__ = ("_value",)
+
     def __init__(self, value: int) -> None:
         super().__init__()
         self._value = value
-        self._behaviors[ResolveTimeSteps.CALC_ATTACK_DAMAGE] = self._ap
 
-    def _ap(self, state: State) -> FrozenSet[State]:
+    def _ap(self, state: State) -> Collection[State]:
         """Add AP damage before MOD_ATTACK_DAMAGE step to preempt Marginal Hit rule"""
-        if state.get_effects(name=RuleEffects.Miss):
-            return frozenset({state})
+        if state.has(RuleEffects.Miss):
+            return (state,)
 
         state = state.remove_effects(name=AttackEffects.MarginalHit)
-        attack_damage = state.sum_effects(name=AttackEffects.AttackDamage)
-        mos = state.sum_effects(name=RuleEffects.MoS)
+        attack_damage = state.sum(AttackEffects.AttackDamage)
+        mos = state.sum(RuleEffects.MoS)
         ap_damage = min(self._value, mos)
-        if ap_damage == Decimal(0):
-            ap_damage = Decimal(1)
+        if ap_damage == 0:
+            ap_damage = 1
         # Only credit AP if it actually adds damage that wouldn't be done otherwise.
         if ap_damage > attack_damage:
             ap_damage -= attack_damage
-            eff = Effect(name=AttackEffects.AttackDamage, source="AP", value=ap_damage)
+            eff = make_effect(
+                name=AttackEffects.AttackDamage, source="AP", value=ap_damage
+            )
             state = state.add_effect(eff)
 
-        return frozenset({state})
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({ResolveTimeSteps.CALC_ATTACK_DAMAGE: _ap})
 
 
 class AntiAirComponent(Component):
     """Extra die if shooting at Aircraft"""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._AA
+        self._eff = Effect(name=RuleEffects.ModDice, source="AA", value=1)
 
-    def _AA(self, state: State) -> FrozenSet[State]:
-        if state.get_effects(name=ModelTypes.Aircraft):
-            eff = Effect(name=RuleEffects.ModDice, source="AA", value=1)
-            state = state.add_effect(eff)
-        return frozenset({state})
+    def _AA(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _AA})
+    _REQUIREMENTS = MappingProxyType({RollTimeSteps.GATHER_DICE: ModelTypes.Aircraft})
+
+
+_PARTIAL_COVER_NAMES = frozenset([CoverAmount.Partial, *CoverStrength])
+
+
+def _is_partial_cover(effect: Effect) -> bool:
+    return effect.name in _PARTIAL_COVER_NAMES
 
 
 class BlastComponent(Component):
     """Ignore partial cover on indirect fire."""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[RollTimeSteps.CHECK_COVER] = self._blast
+    __slots__ = ()
 
-    def _blast(self, state: State) -> FrozenSet[State]:
-        if state.get_effects(name=AttackMethods.Indirect) and state.get_effects(
-            name=CoverAmount.Partial
-        ):
-            # Define a filter to remove the CoverAmount and CoverStrength effects.
-            state = state.remove_by_filter(
-                lambda e: e.name in [CoverAmount.Partial] + list(CoverStrength)
-            )
-        return frozenset({state})
+    def _blast(self, state: State) -> Collection[State]:
+        if state.has(AttackMethods.Indirect) and state.has(CoverAmount.Partial):
+            # Remove the CoverAmount and CoverStrength effects.
+            state = state.remove_by_filter(_is_partial_cover)
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.CHECK_COVER: _blast})
 
 
 class BrawlComponent(Component):
     """Bonus dice in melee if attacking."""
 
+    __slots__ = ("_eff", "_value")
+
     def __init__(self, value: int) -> None:
         super().__init__()
-        self._value = Decimal(value)
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._brawl
+        self._value = value
+        self._eff = Effect(
+            name=RuleEffects.ModDice, source="Weapon Brawl", value=self._value
+        )
 
-    def _brawl(self, state: State) -> FrozenSet[State]:
-        if not state.get_effects(name=AttackMethods.Melee):
-            return frozenset({state})
+    def _brawl(self, state: State) -> Collection[State]:
+        return (state.add_effect(self._eff),)
 
-        eff = Effect(name=RuleEffects.ModDice, source="Weapon Brawl", value=self._value)
-        return frozenset({state.add_effect(eff)})
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _brawl})
+    _REQUIREMENTS = MappingProxyType({RollTimeSteps.GATHER_DICE: AttackMethods.Melee})
 
 
-class HaywireComponent(Component):
-    """Guaranteed status effect, probabilistic damage"""
+_MISS_OR_DESTROYED = frozenset([RuleEffects.Miss, StatusEffects.Destroyed])
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._add_haywire
-        self._behaviors[
-            ResolveTimeSteps.APPLY_EXTRA_DAMAGE
-        ] = self._apply_haywire_damage
 
-    def _add_haywire(self, state: State) -> FrozenSet(State):
-        """Add status effect and pending damage to non-destroyed defender."""
-        if state.get_effects(name=RuleEffects.Miss) or state.get_effects(
-            name=StatusEffects.Destroyed
-        ):
-            return frozenset({state})
+class StatusDamageComponent(Component):
+    """Shared base for status effects that roll pending damage. Subclasses set the
+    pending damage Effect name and the source to credit the damage to."""
 
-        status_eff = Effect(name=StatusEffects.Haywired, source="Haywire")
-        damage_eff = Effect(
-            name=StatusEffects.HaywireDamage, source="Haywire", value=Decimal(1)
-        )
-        state = state.add_effect(status_eff).add_effect(damage_eff)
+    __slots__ = ()
 
-        return frozenset({state})
+    _damage_name: StatusEffects = None
+    _source: str = None
 
-    def _apply_haywire_damage(self, state: State) -> FrozenSet(State):
-        """Apply pending haywire damage if defender has not removed effect yet"""
-        haywire = state.sum_effects(name=StatusEffects.HaywireDamage)
-        dmg_probs = all_probs_threshold(dice=int(haywire), sides=6, val=4)
-        state = state.remove_effects(name=StatusEffects.HaywireDamage)
-        results = set()
-        for val, prob in dmg_probs.items():
+    def _roll_damage(self, state: State) -> Collection[State]:
+        """Apply pending status damage if defender has not removed effect yet"""
+        if not state.has(self._damage_name):
+            return (state,)  # Nothing pending, e.g. a miss or a resisted status
+
+        damage = state.sum(self._damage_name)
+        dmg_probs = threshold_probs(dice=int(damage), sides=6, val=4)
+        state = state.remove_effects(name=self._damage_name)
+        state_prob = state.prob
+        results = []
+        for val, prob in dmg_probs:
             if val > 0:
-                eff = Effect(
+                eff = make_effect(
                     name=AttackEffects.BonusDamage,
-                    source="Haywire",
-                    value=Decimal(val),
+                    source=self._source,
+                    value=val,
                 )
                 new_state = apply_damage(
-                    state=replace(state, prob=Decimal(prob) * state.prob).add_effect(
-                        eff
-                    ),
+                    state=replace(state, prob=prob * state_prob).add_effect(eff),
                     filter={"name": eff.name, "source": eff.source},
                 )
-                results.add(new_state)
+                results.append(new_state)
             else:
-                results.add(replace(state, prob=Decimal(prob) * state.prob))
-        return frozenset(results)
+                results.append(replace(state, prob=prob * state_prob))
+        return tuple(results)
 
 
-class FireComponent(Component):
+class HaywireComponent(StatusDamageComponent):
     """Guaranteed status effect, probabilistic damage"""
 
+    __slots__ = ()
+
+    _damage_name = StatusEffects.HaywireDamage
+    _source = "Haywire"
+    _status_eff = Effect(name=StatusEffects.Haywired, source="Haywire")
+    _damage_eff = Effect(name=StatusEffects.HaywireDamage, source="Haywire", value=1)
+
+    def _add_haywire(self, state: State) -> Collection[State]:
+        """Add status effect and pending damage to non-destroyed defender."""
+        if state.has_any(_MISS_OR_DESTROYED):
+            return (state,)
+
+        state = state.add_effect(self._status_eff).add_effect(self._damage_eff)
+
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            ResolveTimeSteps.ADD_EXTRA_EFFECTS: _add_haywire,
+            ResolveTimeSteps.APPLY_EXTRA_DAMAGE: StatusDamageComponent._roll_damage,
+        }
+    )
+
+
+class FireComponent(StatusDamageComponent):
+    """Guaranteed status effect, probabilistic damage"""
+
+    __slots__ = ("_damage_eff", "_value")
+
+    _damage_name = StatusEffects.FireDamage
+    _source = "Fire"
+
     def __init__(self, value: int) -> None:
         super().__init__()
         self._value = value
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._add_fire
-        self._behaviors[ResolveTimeSteps.APPLY_EXTRA_DAMAGE] = self._apply_fire_damage
+        self._damage_eff = Effect(
+            name=StatusEffects.FireDamage, source="Fire", value=self._value
+        )
 
-    def _add_fire(self, state: State) -> FrozenSet(State):
+    def _add_fire(self, state: State) -> Collection[State]:
         """Add status effect and pending damage to non-destroyed defender."""
-        if state.get_effects(name=RuleEffects.Miss) or state.get_effects(
-            name=StatusEffects.Destroyed
-        ):
-            return frozenset({state})
+        if state.has_any(_MISS_OR_DESTROYED):
+            return (state,)
 
-        damage_eff = Effect(
-            name=StatusEffects.FireDamage, source="Fire", value=self._value
-        )
-        state = state.add_effect(damage_eff)
+        state = state.add_effect(self._damage_eff)
 
-        return frozenset({state})
+        return (state,)
 
-    def _apply_fire_damage(self, state: State) -> FrozenSet(State):
-        """Apply pending fire damage if defender has not removed effect yet"""
-        fire = state.sum_effects(name=StatusEffects.FireDamage)
-        dmg_probs = all_probs_threshold(dice=int(fire), sides=6, val=4)
-        state = state.remove_effects(name=StatusEffects.FireDamage)
-        results = set()
-        for val, prob in dmg_probs.items():
-            if val > 0:
-                eff = Effect(
-                    name=AttackEffects.BonusDamage,
-                    source="Fire",
-                    value=Decimal(val),
-                )
-                new_state = apply_damage(
-                    state=replace(state, prob=Decimal(prob) * state.prob).add_effect(
-                        eff
-                    ),
-                    filter={"name": eff.name, "source": eff.source},
-                )
-                results.add(new_state)
-            else:
-                results.add(replace(state, prob=Decimal(prob) * state.prob))
-        return frozenset(results)
+    _BEHAVIORS = MappingProxyType(
+        {
+            ResolveTimeSteps.ADD_EXTRA_EFFECTS: _add_fire,
+            ResolveTimeSteps.APPLY_EXTRA_DAMAGE: StatusDamageComponent._roll_damage,
+        }
+    )
 
 
-class CorrosionComponent(Component):
+class CorrosionComponent(StatusDamageComponent):
     """Guaranteed status effect, probabilistic damage"""
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._behaviors[ResolveTimeSteps.ADD_EXTRA_EFFECTS] = self._add_corrosion
-        self._behaviors[ResolveTimeSteps.END_OF_ROUND] = self._apply_corrosion_damage
+    __slots__ = ()
 
-    def _add_corrosion(self, state: State) -> FrozenSet(State):
+    _damage_name = StatusEffects.CorrosionDamage
+    _source = "Corrosion"
+    _status_eff = Effect(name=StatusEffects.Corrosion, source="Corrosion", value=1)
+    _damage_eff = Effect(
+        name=StatusEffects.CorrosionDamage, source="Corrosion", value=1
+    )
+
+    def _add_corrosion(self, state: State) -> Collection[State]:
         """Add status effect and pending damage to non-destroyed defender."""
-        if state.get_effects(name=RuleEffects.Miss) or state.get_effects(
-            name=StatusEffects.Destroyed
-        ):
-            return frozenset({state})
+        if state.has_any(_MISS_OR_DESTROYED):
+            return (state,)
 
-        status_eff = Effect(
-            name=StatusEffects.Corrosion, source="Corrosion", value=Decimal(1)
-        )
-        damage_eff = Effect(
-            name=StatusEffects.CorrosionDamage, source="Corrosion", value=Decimal(1)
-        )
-        state = state.add_effect(status_eff).add_effect(damage_eff)
+        state = state.add_effect(self._status_eff).add_effect(self._damage_eff)
 
-        return frozenset({state})
+        return (state,)
 
-    def _apply_corrosion_damage(self, state: State) -> FrozenSet(State):
-        """Apply pending corrosion damage if defender has not removed effect yet"""
-        corrosion = state.sum_effects(name=StatusEffects.CorrosionDamage)
-        dmg_probs = all_probs_threshold(dice=int(corrosion), sides=6, val=4)
-        state = state.remove_effects(name=StatusEffects.CorrosionDamage)
-        results = set()
-        for val, prob in dmg_probs.items():
-            if val > 0:
-                eff = Effect(
-                    name=AttackEffects.BonusDamage,
-                    source="Corrosion",
-                    value=Decimal(val),
-                )
-                new_state = apply_damage(
-                    state=replace(state, prob=Decimal(prob) * state.prob).add_effect(
-                        eff
-                    ),
-                    filter={"name": eff.name, "source": eff.source},
-                )
-                results.add(new_state)
-            else:
-                results.add(replace(state, prob=Decimal(prob) * state.prob))
-        return frozenset(results)
+    _BEHAVIORS = MappingProxyType(
+        {
+            ResolveTimeSteps.ADD_EXTRA_EFFECTS: _add_corrosion,
+            ResolveTimeSteps.END_OF_ROUND: StatusDamageComponent._roll_damage,
+        }
+    )
 
 
 class AdvancedComponent(Component):
     """Add +1 result at optimal range"""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_RESULT_BONUSES] = self._add_result
+        self._eff = Effect(name=RuleEffects.ModResult, source="Advanced", value=1)
 
-    def _add_result(self, state: State) -> FrozenSet(State):
+    def _add_result(self, state: State) -> Collection[State]:
         """Add +1 result only if at Optimal range"""
-        if state.get_effects(name=Ranges.Optimal):
-            eff = Effect(name=RuleEffects.ModResult, source="Advanced", value=1)
-            state = state.add_effect(effect=eff)
-        return frozenset({state})
+        return (state.add_effect(effect=self._eff),)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_RESULT_BONUSES: _add_result})
+    _REQUIREMENTS = MappingProxyType(
+        {RollTimeSteps.GATHER_RESULT_BONUSES: Ranges.Optimal}
+    )
 
 
 class GuidedComponent(Component):
     """Add a die if a Fire Mission with TD is active."""
 
+    __slots__ = ("_eff",)
+
     def __init__(self) -> None:
         super().__init__()
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._dice_mod
+        self._eff = Effect(name=RuleEffects.ModDice, source="Guided", value=1)
 
-    def _dice_mod(self, state: State) -> FrozenSet[State]:
+    def _dice_mod(self, state: State) -> Collection[State]:
         """Add dice mod for guided indirect attack, if TD present"""
-        if state.get_effects(name=AttackEffects.FireMission) and state.get_effects(
-            name=AttackEffects.TD
-        ):
-            eff = Effect(name=RuleEffects.ModDice, source="Guided", value=1)
-            state = state.add_effect(eff)
-        return frozenset({state})
+        if state.has(AttackEffects.FireMission) and state.has(AttackEffects.TD):
+            state = state.add_effect(self._eff)
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType({RollTimeSteps.GATHER_DICE: _dice_mod})
 
 
 class RangeComponent(Component):
     """Apply dice mod to ranged attacks if necessary. Add range effect to trigger
     other components' behaviors."""
 
+    __slots__ = ("_dice_eff", "_range", "_range_eff")
+
     def __init__(self, range: Ranges) -> None:
         super().__init__()
         self._range = range
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._set_range
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._dice_mod
+        self._range_eff = Effect(name=self._range, source="Range")
+        self._dice_eff = Effect(
+            name=RuleEffects.ModDice, source=self._range.name, value=-1
+        )
 
-    def _set_range(self, state: State) -> FrozenSet[State]:
+    def _set_range(self, state: State) -> Collection[State]:
         """Add range effect for other components"""
-        eff = Effect(name=self._range, source="Range")
-        return frozenset({state.add_effect(eff)})
+        return (state.add_effect(self._range_eff),)
 
-    def _dice_mod(self, state: State) -> FrozenSet[State]:
+    def _dice_mod(self, state: State) -> Collection[State]:
         """Add dice mod for range"""
-        if self._range == Ranges.Suboptimal and not state.get_effects(
-            name=AttackMethods.Melee
-        ):
-            eff = Effect(
-                name=RuleEffects.ModDice, source=self._range.name, value=Decimal(-1)
-            )
-            state = state.add_effect(eff)
+        if self._range is Ranges.Suboptimal and not state.has(AttackMethods.Melee):
+            state = state.add_effect(self._dice_eff)
+
+        return (state,)
 
-        return frozenset({state})
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _set_range,
+            RollTimeSteps.GATHER_DICE: _dice_mod,
+        }
+    )
 
 
 class MethodComponent(Component):
     """Apply dice mod to ranged attacks based on method. Add method effect to trigger
     other components' behaviors."""
 
+    __slots__ = ("_dice_eff", "_method", "_method_eff")
+
     def __init__(self, method: AttackMethods) -> None:
         super().__init__()
         self._method = method
-        self._behaviors[RollTimeSteps.INITIALIZE] = self._set_method
-        self._behaviors[RollTimeSteps.GATHER_DICE] = self._dice_mod
+        self._method_eff = Effect(name=self._method, source="Attack Method")
+        self._dice_eff = Effect(
+            name=RuleEffects.ModDice, source=self._method.name, value=-1
+        )
 
-    def _set_method(self, state: State) -> FrozenSet[State]:
+    def _set_method(self, state: State) -> Collection[State]:
         """Add attack method effect for other components"""
-        eff = Effect(name=self._method, source="Attack Method")
-        return frozenset({state.add_effect(eff)})
-
-    def _dice_mod(self, state: State) -> FrozenSet[State]:
-        """Add dice mod for attack method"""
-        mod = 0
-        if self._method == AttackMethods.Indirect:
-            mod -= 1
-            if state.get_effects(name=AttackEffects.FireMission):
-                mod += 1
-        eff = Effect(name=RuleEffects.ModDice, source=self._method.name, value=mod)
-
-        return frozenset({state.add_effect(eff)})
-
-
-WEAPON_TRAIT_DEFS = {
-    "Damage": Trait(
-        partial(BasicTraitComponent, effect_name=AttackEffects.WeaponDamage),
-        required_params=["value"],
-        valid_role=[],
-    ),
-    "Range": Trait(
-        partial(RangeComponent),
-        required_params=["range"],
-        valid_role=[],
-    ),
-    "Advanced": Trait(
-        partial(AdvancedComponent),
-    ),
-    "AESecondary": Trait(
-        partial(DiceBonusComponent, source="AE Secondary Target", value=-1),
-        valid_role=[],
-    ),
-    "AntiAir": Trait(
-        partial(AntiAirComponent),
-    ),
-    "Precise": Trait(
-        partial(ResultBonusComponent, source="Precise", value=1),
-    ),
-    "AntiInfantry": Trait(
-        partial(
-            BasicTraitComponent,
-            effect_name=AttackEffects.AntiInfantry,
-            source="AntiInfantry",
+        return (state.add_effect(self._method_eff),)
+
+    def _dice_mod(self, state: State) -> Collection[State]:
+        """Add dice mod for attack method. Only Indirect attacks without a Fire
+        Mission have one, so every other State is passed on unchanged."""
+        if self._method is AttackMethods.Indirect and not state.has(
+            AttackEffects.FireMission
+        ):
+            state = state.add_effect(self._dice_eff)
+
+        return (state,)
+
+    _BEHAVIORS = MappingProxyType(
+        {
+            RollTimeSteps.INITIALIZE: _set_method,
+            RollTimeSteps.GATHER_DICE: _dice_mod,
+        }
+    )
+
+
+# Wrapped in a read-only view so trait definitions can't be altered at runtime
+WEAPON_TRAIT_DEFS = MappingProxyType(
+    {
+        "Damage": Trait(
+            partial(BasicTraitComponent, effect_name=AttackEffects.WeaponDamage),
+            required_params=["value"],
+            valid_role=[],
+        ),
+        "Range": Trait(
+            RangeComponent,
+            required_params=["range"],
+            valid_role=[],
+        ),
+        "Advanced": Trait(
+            AdvancedComponent,
+        ),
+        "AESecondary": Trait(
+            partial(DiceBonusComponent, source="AE Secondary Target", value=-1),
+            valid_role=[],
+        ),
+        "AntiAir": Trait(
+            AntiAirComponent,
+        ),
+        "Precise": Trait(
+            partial(ResultBonusComponent, source="Precise", value=1),
+        ),
+        "AntiInfantry": Trait(
+            partial(
+                BasicTraitComponent,
+                effect_name=AttackEffects.AntiInfantry,
+                source="AntiInfantry",
+            ),
+        ),
+        "AP": Trait(
+            APComponent,
+            required_params=["value"],
+        ),
+        "Blast": Trait(BlastComponent),
+        "FireMission": Trait(
+            partial(
+                BasicTraitComponent,
+                effect_name=AttackEffects.FireMission,
+                source="Fire Mission",
+            ),
+            valid_role=[],
+        ),
+        "Burst": Trait(
+            partial(DiceBonusComponent, source="Burst"),
+            required_params=["value"],
+        ),
+        "Focus": Trait(
+            partial(DiceBonusComponent, source="Focus", value=1),
+            valid_role=[],
+        ),
+        "Frag": Trait(
+            partial(DiceBonusComponent, source="Frag", value=2),
         ),
-    ),
-    "AP": Trait(
-        partial(APComponent),
-        required_params=["value"],
-    ),
-    "Blast": Trait(partial(BlastComponent)),
-    "FireMission": Trait(
-        partial(
-            BasicTraitComponent,
-            effect_name=AttackEffects.FireMission,
-            source="Fire Mission",
+        "Splitting": Trait(
+            partial(DiceBonusComponent, source="Split", value=-1),
         ),
-        valid_role=[],
-    ),
-    "Burst": Trait(
-        partial(DiceBonusComponent, source="Burst"),
-        required_params=["value"],
-    ),
-    "Focus": Trait(
-        partial(DiceBonusComponent, source="Focus", value=1),
-        valid_role=[],
-    ),
-    "Frag": Trait(
-        partial(DiceBonusComponent, source="Frag", value=2),
-    ),
-    "Splitting": Trait(
-        partial(DiceBonusComponent, source="Split", value=-1),
-    ),
-    "Link": Trait(
-        partial(DiceBonusComponent, source="Link", value=1),
-    ),
-    "Brawl": Trait(
-        partial(BrawlComponent),
-        required_params=["value"],
-    ),
-    "Guided": Trait(
-        partial(GuidedComponent),
-    ),
-    "Method": Trait(
-        partial(MethodComponent),
-        required_params=["method"],
-        valid_role=[],
-    ),
-    "Haywire": Trait(
-        partial(HaywireComponent),
-    ),
-    "Fire": Trait(
-        partial(FireComponent),
-        required_params=["value"],
-    ),
-    "Corrosion": Trait(
-        partial(CorrosionComponent),
-    ),
-    "TD": Trait(
-        partial(BasicTraitComponent, effect_name=AttackEffects.TD, source="TD"),
-        valid_role=[],
-    ),
-}
+        "Link": Trait(
+            partial(DiceBonusComponent, source="Link", value=1),
+        ),
+        "Brawl": Trait(
+            BrawlComponent,
+            required_params=["value"],
+        ),
+        "Guided": Trait(
+            GuidedComponent,
+        ),
+        "Method": Trait(
+            MethodComponent,
+            required_params=["method"],
+            valid_role=[],
+        ),
+        "Haywire": Trait(
+            HaywireComponent,
+        ),
+        "Fire": Trait(
+            FireComponent,
+            required_params=["value"],
+        ),
+        "Corrosion": Trait(
+            CorrosionComponent,
+        ),
+        "TD": Trait(
+            partial(BasicTraitComponent, effect_name=AttackEffects.TD, source="TD"),
+            valid_role=[],
+        ),
+    }
+)
 
 
 # MELEE_ONLY_TRAITS = ["Brawl"]
@@ -433,20 +448,37 @@ WEAPON_TRAIT_DEFS = {
 
 
 def weapon_trait_to_component(name: str, **kwargs) -> Component:
+    """Weapon Components never change once made, so identical traits share a single
+    cached instance."""
+    key = frozenset(kwargs.items())
+    try:
+        hash(key)
+    except TypeError:  # Unhashable params can't be cached
+        return _make_weapon_component(name, **kwargs)
+    return _cached_weapon_component(name, key)
+
+
+@lru_cache(maxsize=1024)
+def _cached_weapon_component(
+    name: str, params: FrozenSet[Tuple[str, Any]]
+) -> Component:
+    return _make_weapon_component(name, **dict(params))
+
+
+def _make_weapon_component(name: str, **kwargs) -> Component:
     # print(f"{name}: {kwargs}")
-    trait_factory = WEAPON_TRAIT_DEFS[name].factory
-    missing = set(WEAPON_TRAIT_DEFS[name].required_params).difference(
-        set(kwargs.keys())
-    )
+    trait = WEAPON_TRAIT_DEFS[name]
+    trait_factory = trait.factory
+    missing = trait.required_params - kwargs.keys()
     if missing:
         print(f"Attempted to make {name} trait without required params: {missing}")
     return trait_factory(**kwargs)
 
 
 def make_weapon_components(
-    weapon_params: Sequence[Mapping[str, Union[str, Decimal]]]
-) -> frozenset(Component):
-    return frozenset(weapon_trait_to_component(**params) for params in weapon_params)
+    weapon_params: Sequence[Mapping[str, Union[str, int]]]
+) -> Tuple[Component]:
+    return tuple([weapon_trait_to_component(**params) for params in weapon_params])
 
 
 if __name__ == "__main__":
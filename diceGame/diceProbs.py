@@ -7,8 +7,10 @@ possible outcome values to probability of seeing that value.
 
 from __future__ import annotations
 from collections import Counter
-from itertools import product
-from typing import Dict, Iterable
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from operator import mul
+from typing import Dict, Iterable, Tuple
 import math
 
 
@@ -26,9 +28,17 @@ def all_probs_high_die(dice: int, sides: int) -> Dict[int, float]:
     """Return a dictionary of the probabilities that the highest single face of
     any die in a roll will be X, where X ranges from 1 to [sides].
 
-    Format: {high roll : probability of high roll}"""
+    Format: {high roll : probability of high roll}
 
-    return {(k + 1): prob_max_roll(dice, sides, k + 1) for k in range(sides)}
+    Same as prob_max_roll() for each face, but each face's cumulative chance is
+    reused as the next face's lower bound instead of being raised to a power twice."""
+    probs = {}
+    prev = 0.0 ** dice  # Matches prob_max_roll() for val=1, including zero dice
+    for val in range(1, sides + 1):
+        cur = (val / sides) ** dice
+        probs[val] = cur - prev
+        prev = cur
+    return probs
 
 
 def all_probs_threshold(dice: int, sides: int, val: int) -> Dict[int, float]:
@@ -40,10 +50,44 @@ def all_probs_threshold(dice: int, sides: int, val: int) -> Dict[int, float]:
         return {0: 1.0}
 
     dieChance = max(0, (sides - val) + 1) / sides
-    return {
-        k: math.comb(dice, k) * (dieChance ** k) * (1 - dieChance) ** (dice - k)
-        for k in range(dice + 1)
-    }
+    # Build the powers of each chance and the binomial coefficients by repeated
+    # multiplication rather than raising powers and calling math.comb() for every k
+    hits = [1.0] * (dice + 1)
+    misses = [1.0] * (dice + 1)
+    for k in range(1, dice + 1):
+        hits[k] = hits[k - 1] * dieChance
+        misses[k] = misses[k - 1] * (1 - dieChance)
+
+    probs = {}
+    ways = 1
+    for k in range(dice + 1):
+        probs[k] = ways * hits[k] * misses[dice - k]
+        ways = ways * (dice - k) // (k + 1)
+    return probs
+
+
+@lru_cache(maxsize=None)
+def threshold_probs(dice: int, sides: int, val: int) -> Tuple[Tuple[int, float]]:
+    """Cached all_probs_threshold() for use in hot loops, where the same few dice
+    pools are checked over and over.
+
+    Format: ((num dice, probability of num dice), ...) as a tuple, so that cached
+    results can't be modified by callers."""
+    return tuple(all_probs_threshold(dice, sides, val).items())
+
+
+def weighted_rolls(dice: int) -> Iterable[Tuple[Tuple[int, ...], int]]:
+    """Generate every distinct d6 roll, ignoring order, with the number of ordered
+    rolls that produce it. Covers the same outcomes as itertools.product() without
+    walking all 6**dice of them.
+
+    Format: (sorted roll, ways to roll it)"""
+    ways = math.factorial(dice)
+    for roll in combinations_with_replacement((1, 2, 3, 4, 5, 6), dice):
+        count = ways
+        for face in set(roll):
+            count //= math.factorial(roll.count(face))
+        yield roll, count
 
 
 def all_probs_brute_force_max_roll(dice: int) -> Dict[int, float]:
@@ -51,13 +95,15 @@ def all_probs_brute_force_max_roll(dice: int) -> Dict[int, float]:
     the results.
 
     Explanation:
-    1. Use itertools.product() to generate all combinations of die rolls
-    2. Use map() to transform each set of rolls into a single max value
+    1. Use weighted_rolls() to generate all combinations of die rolls
+    2. Use max() to transform each set of rolls into a single max value
     3. Use collections.Counter type to generate a dictionary with the count of each
-        value.
+        value, weighted by the number of ways to roll it.
     """
 
-    count = Counter(map(max, product((1, 2, 3, 4, 5, 6), repeat=dice)))
+    count = Counter()
+    for roll, ways in weighted_rolls(dice):
+        count[max(roll)] += ways
     rolls = sum(count.values())
     return {k: v / rolls for k, v in count.items()}
 
@@ -67,8 +113,11 @@ def all_probs_drop_high(dice: int) -> Dict[int, float]:
     the highest, and counting the results. Useful for verifying HGB skill bonus.
 
     Explanation:
-    Same as all_probs_brute_force_max_roll() except drop the high die first."""
-    count = Counter(map(max, map(drop_high, product((1, 2, 3, 4, 5, 6), repeat=dice))))
+    Same as all_probs_brute_force_max_roll() except drop the high die first. Rolls
+    from weighted_rolls() are sorted, so the high die left is the second to last."""
+    count = Counter()
+    for roll, ways in weighted_rolls(dice):
+        count[roll[-2]] += ways
     rolls = sum(count.values())
     return {k: v / rolls for k, v in count.items()}
 
@@ -87,7 +136,7 @@ def check_accuracy(maxDice=9):
 
 def expected(pdf: Dict[int, float]) -> float:
     """Returns the 'average' result of a probability distribution function."""
-    return sum(k * v for k, v in pdf.items())
+    return sum(map(mul, pdf.keys(), pdf.values()))
 
 
 def standard_dev(pdf: Dict[int, float]) -> float:
@@ -1,35 +1,87 @@
 from __future__ import annotations
+import sys
 from collections import defaultdict
 from dataclasses import dataclass, field, replace
-from decimal import Decimal
+from functools import lru_cache
 from operator import attrgetter
+from types import MappingProxyType
 from typing import (
+    AbstractSet,
+    Any,
     Callable,
+    Collection,
     DefaultDict,
     Dict,
     FrozenSet,
     Hashable,
+    Iterable,
     List,
+    Mapping,
+    Sequence,
+    Tuple,
 )
 
+# Keyword arguments to give dataclasses __slots__ where supported (Python 3.10+)
+SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+# Bit flags for Effect names, assigned as each new name is first seen
+_NAME_BITS: Dict[Hashable, int] = {}
+
+
+def name_bit(name: Hashable) -> int:
+    """Return the bit flag standing for an Effect name in State name masks."""
+    bit = _NAME_BITS.get(name)
+    if bit is None:
+        bit = _NAME_BITS[name] = 1 << len(_NAME_BITS)
+    return bit
+
+
+@lru_cache(maxsize=None)
+def attrs_getter(keys: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """Return an attrgetter for the given attribute names. Cached, since the same few
+    sets of names are used to filter Effects over and over."""
+    return attrgetter(*keys)
+
+
+def attrs_filter(kwargs: Mapping[str, Any]) -> Callable[[Any], bool]:
+    """Return a predicate matching objects whose attributes equal kwargs. All the
+    attributes are pulled with one cached attrgetter and compared at once."""
+    if not kwargs:
+        return lambda obj: True
+    keys = tuple(kwargs)
+    getter = attrs_getter(keys)
+    values = tuple(kwargs.values()) if len(keys) > 1 else kwargs[keys[0]]
+    return lambda obj: getter(obj) == values
+
+
+@dataclass(frozen=True, **SLOTS)
 class BaseEffect:
     """Base Effect class has no definition. Subclass for specific game needs"""
 
     pass
 
 
-@dataclass(order=True, frozen=True)
+@dataclass(order=True, frozen=True, **SLOTS)
 class State:
     """The State class represents one possible game state. State objects are immutable.
 
     prob: Probability of arriving at the given game state.
     effects: Set of game effects describing the game state, e.g. damage, status, etc.
+
+    Every field is immutable and hashable, so States (and collections of them) are
+    safe to share and to cache. Lookups cached from the effects are left out of
+    comparisons.
+
+    Effects are expected to have a name attribute, used by has() for quick presence
+    checks against a bitmask of all the names in the State.
     """
 
-    prob: Decimal = Decimal(1)
+    prob: float = 1.0
     effects: FrozenSet(BaseEffect) = field(default_factory=frozenset)
+    _name_mask: int = field(default=None, init=False, repr=False, compare=False)
+    _by_name: Dict[Hashable, Tuple[BaseEffect, ...]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __str__(self) -> str:
         strs = [f"Prob: {self.prob:.2%}"]
@@ -37,33 +89,105 @@ class State:
         strs.extend([f"\t{str(eff)}" for eff in sorted_effects])
         return "\n".join(strs)
 
+    @property
+    def name_mask(self) -> int:
+        """Bitmask of the names of all Effects in the State. Built on first use."""
+        mask = self._name_mask
+        if mask is None:
+            mask = 0
+            for eff in self.effects:
+                mask |= name_bit(eff.name)
+            # State is frozen, so bypass the dataclass __setattr__ to cache it
+            object.__setattr__(self, "_name_mask", mask)
+        return mask
+
+    @property
+    def by_name(self) -> Dict[Hashable, Tuple[BaseEffect, ...]]:
+        """Effects grouped by name, so lookups by name only walk matching Effects.
+        Built on first use."""
+        index = self._by_name
+        if index is None:
+            buckets = defaultdict(list)
+            for eff in self.effects:
+                buckets[eff.name].append(eff)
+            index = {name: tuple(effs) for name, effs in buckets.items()}
+            object.__setattr__(self, "_by_name", index)
+        return index
+
+    def has(self, name: Hashable) -> bool:
+        """Check whether the State has any Effect with the given name"""
+        return bool(self.name_mask & name_bit(name))
+
+    def has_any(self, names: Iterable[Hashable]) -> bool:
+        """Check whether the State has an Effect with any of the given names"""
+        mask = 0
+        for name in names:
+            mask |= name_bit(name)
+        return bool(self.name_mask & mask)
+
     def add_effect(self, effect: BaseEffect = None) -> State:
         """Add an Effect to the state"""
         if effect is None:
             return self
-        return replace(self, effects=self.effects.union({effect}))
+        new_state = replace(self, effects=self.effects.union({effect}))
+        if self._name_mask is not None:  # Extend a known mask rather than rebuild it
+            mask = self._name_mask | name_bit(effect.name)
+            object.__setattr__(new_state, "_name_mask", mask)
+        return new_state
 
     def remove_effects(self, **kwargs) -> State:
         """Removes Effects whose attributes match kwargs"""
 
-        def filter(effect: BaseEffect) -> bool:
-            return all(attrgetter(k)(effect) == v for k, v in kwargs.items())
-
+        filter = attrs_filter(kwargs)
         return replace(
             self, effects=frozenset(e for e in self.effects if not filter(e))
         )
 
+    def replace_effects(self, new: BaseEffect = None, **kwargs) -> State:
+        """Removes Effects whose attributes match kwargs and adds a new Effect in their
+        place, if given. Cheaper than remove_effects() then add_effect(), as only
+        one new State is built."""
+
+        filter = attrs_filter(kwargs)
+        effects = [e for e in self.effects if not filter(e)]
+        if new is not None:
+            effects.append(new)
+        return replace(self, effects=frozenset(effects))
+
+    def evolve(
+        self,
+        add: Iterable[BaseEffect] = (),
+        remove: Callable[[BaseEffect], bool] = None,
+        prob: float = None,
+    ) -> State:
+        """Removes Effects matching the remove predicate, adds the Effects in add and
+        sets a new prob, if given, all at once. Cheaper than chaining replace(),
+        remove_by_filter() and add_effect(), which each build a new State."""
+        effects = self.effects
+        if remove is not None:
+            effects = [e for e in effects if not remove(e)]
+            effects.extend(add)
+            effects = frozenset(effects)
+        elif add:
+            effects = effects.union(add)
+        if prob is None:
+            prob = self.prob
+        return replace(self, prob=prob, effects=effects)
+
     def remove_by_filter(self, pred: Callable[[BaseEffect], bool]) -> State:
         """Removes Effects matching a predicate"""
         return replace(self, effects=frozenset(e for e in self.effects if not pred(e)))
 
     def get_effects(self, **kwargs) -> FrozenSet(BaseEffect):
         """Returns Effects whose attributes match kwargs"""
+        effects = self.effects
+        if "name" in kwargs:
+            if not self.has(kwargs["name"]):
+                return frozenset()  # Skip the scan when no Effect has that name
+            effects = self.by_name[kwargs["name"]]
 
-        def filter(effect: BaseEffect) -> bool:
-            return all(attrgetter(k)(effect) == v for k, v in kwargs.items())
-
-        return frozenset(e for e in self.effects if filter(e))
+        filter = attrs_filter(kwargs)
+        return frozenset(e for e in effects if filter(e))
 
     def get_by_filter(
         self, pred: Callable[[BaseEffect], bool]
@@ -71,22 +195,34 @@ class State:
         """Returns Effects matching a predicate"""
         return frozenset(e for e in self.effects if pred(e))
 
-    def sum_effects(self, **kwargs) -> Decimal:
+    def sum_effects(self, **kwargs) -> float:
         """Returns sum of value attributes of Effects whose attributes match kwargs"""
         effects = self.get_effects(**kwargs)
         return sum(map(attrgetter("value"), effects))
 
-    def sum_by_filter(self, pred: Callable[[BaseEffect], bool]) -> Decimal:
+    def sum(self, name: Hashable, source: Hashable = None) -> float:
+        """Positional fast path for sum_effects(name=..., source=...). A source of
+        None matches any source."""
+        if not self.has(name):
+            return 0
+        effects = self.by_name[name]
+        if source is None:
+            return sum(e.value for e in effects)
+        return sum(e.value for e in effects if e.source == source)
+
+    def sum_by_filter(self, pred: Callable[[BaseEffect], bool]) -> float:
         """Return sum of value attributes of Effects matching a predicate"""
         effects = self.get_by_filter(pred)
         return sum(map(attrgetter("value"), effects))
 
 
 # Type alias
-Behavior = Callable[[State], FrozenSet[State]]
+Behavior = Callable[[State], Collection[State]]
 """A Behavior is a function that operates on one State and returns an immutable
-set of one or more States. This is necessary because some rules may be probabilistic
-and thus cause a single input State to branch into multiple output States.
+collection of one or more States. This is necessary because some rules may be
+probabilistic and thus cause a single input State to branch into multiple output
+States. Behaviors that produce a single State can simply return a 1-tuple (state,),
+which is much cheaper to build than a frozenset.
 """
 
 
@@ -95,35 +231,58 @@ class Component:
     can have multiple behaviors that activate on specific events/messages to perform
     their functions. Messages trigger methods by dispatching through a map.
 
-    Subclass Component to define their actual Behaviors, then map Behaviors to messages
-    in the subclass's __init__() function.
+    Subclass Component to define their actual Behaviors, then map messages to those
+    methods in the subclass's _BEHAVIORS table. The table is shared by every instance
+    of the class, so it holds plain functions that are called with the Component.
+    Individual instances may still add their own Behaviors with set_behavior().
 
     Components can express which messages they have behaviors for, so they only receive
     those messages. If passed a message for which they do not have a defined behavior,
     they return the state unchanged.
+
+    A Behavior that only applies when a State has a particular Effect can register
+    that Effect's name in _REQUIREMENTS under the same message. States lacking it
+    are passed through unchanged without calling the Behavior at all.
+
+    Components are created in large numbers, so subclasses should declare __slots__
+    for any attributes they add.
     """
 
+    _BEHAVIORS: Mapping[
+        Hashable, Callable[[Component, State], Collection[State]]
+    ] = MappingProxyType({})
+    _REQUIREMENTS: Mapping[Hashable, Hashable] = MappingProxyType({})
+
+    __slots__ = ("_behaviors", "_parent")
+
     def __init__(self) -> None:
-        # For safety, there is a default behavior for any message that returns the
-        # passed state unchanged.
-        self._behaviors: Dict[Hashable, Behavior] = defaultdict(
-            lambda: self._null_behavior
-        )
+        # Per-instance Behaviors are rare, so the dict is only made when needed
+        self._behaviors: Dict[Hashable, Behavior] = None
         self._parent: Entity = None
 
-    def _null_behavior(self, state: State) -> FrozenSet[State]:
-        return frozenset({state})
+    def set_behavior(self, msg: Hashable, behavior: Behavior) -> None:
+        """Map a message to a Behavior for this instance only, overriding _BEHAVIORS"""
+        if self._behaviors is None:
+            self._behaviors = {}
+        self._behaviors[msg] = behavior
 
     def valid_messages(self) -> FrozenSet(Hashable):
-        # Report which messages this Component responds to. May contain messages
-        # for which it has a null behavior if it was erroneously passed those
-        # messages previously, as they will be added to the defaultdict as keys.
-        return frozenset(self._behaviors.keys())
-
-    def run(self, msg: Hashable, state: State) -> FrozenSet[State]:
-        # if self._behaviors[msg](state) is None:
-        #     print(f"{self.__class__}, {msg}")
-        return self._behaviors[msg](state)
+        # Report which messages this Component responds to.
+        if self._behaviors is None:
+            return frozenset(self._BEHAVIORS.keys())
+        return frozenset(self._BEHAVIORS.keys() | self._behaviors.keys())
+
+    def run(self, msg: Hashable, state: State) -> Collection[State]:
+        required = self._REQUIREMENTS.get(msg)
+        if required is not None and not state.has(required):
+            return (state,)
+        if self._behaviors is not None and msg in self._behaviors:
+            return self._behaviors[msg](state)
+        behavior = self._BEHAVIORS.get(msg)
+        if behavior is None:
+            # For safety, any unknown message returns the passed state unchanged
+            return (state,)
+        return behavior(self, state)
 
 
 class Entity:
@@ -145,18 +304,36 @@ class Entity:
             self._subscriptions[msg].append(component)
         component._parent = self
 
-    def valid_messages(self) -> FrozenSet(Hashable):
-        return frozenset(self._subscriptions.keys())
+    def components(self, msg: Hashable) -> Sequence[Component]:
+        """The Components subscribed to a message, in the order they were added"""
+        return self._subscriptions.get(msg, ())
+
+    def valid_messages(self) -> AbstractSet[Hashable]:
+        # A live view of the subscribed messages, so membership checks are cheap
+        return self._subscriptions.keys()
 
-    def pass_message(self, msg: Hashable, state: State) -> FrozenSet(State):
-        results = []
+    def pass_message(self, msg: Hashable, state: State) -> Collection[State]:
         working = [state]
-        for component in self._subscriptions[msg]:
-            while working:
-                new_states = component.run(msg=msg, state=working.pop())
-                results.extend(new_states)
-            working, results = results, working
-        return frozenset(working)
+        for component in self._subscriptions.get(msg, ()):
+            results = []
+            for current in working:
+                results.extend(component.run(msg=msg, state=current))
+            working = results
+        # Branches that end in the same outcome only need to be carried on once
+        return merge_states(working) if len(working) > 1 else working
+
+
+def merge_states(states: Iterable[State]) -> List[State]:
+    """Combine States with identical Effects into one State with their summed
+    probability. Different paths can end in the same outcome, and every later step
+    treats those States alike."""
+    merged: Dict[FrozenSet[BaseEffect], State] = {}
+    for state in states:
+        same = merged.get(state.effects)
+        if same is not None:
+            state = replace(same, prob=same.prob + state.prob)
+        merged[state.effects] = state
+    return list(merged.values())
 
 
 def normalize(states: FrozenSet[State]) -> FrozenSet[State]:
@@ -164,6 +341,6 @@ def normalize(states: FrozenSet[State]) -> FrozenSet[State]:
     assuming that one of the given states MUST occur.
     """
     prob_sum = sum(map(attrgetter("prob"), states))
-    scale = Decimal(1) / prob_sum
+    scale = 1.0 / prob_sum
     new_states = [replace(state, prob=state.prob * scale) for state in states]
     return frozenset(new_states)
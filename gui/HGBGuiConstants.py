@@ -9,4 +9,5 @@ UNOPP_SETUP_WINDOW = "unopp_setup_window"
 PLOT_HEIGHT = 450
 PLOT_WIDTH = 425
 BAR_WIDTH = 0.8
+MIN_TICK_SPACING = 20  # Pixels between axis tick labels
 HIDE_TRAITS = []
@@ -2,7 +2,6 @@
 """
 
 import traceback
-from decimal import Decimal
 from functools import partial
 from itertools import chain
 from operator import attrgetter
@@ -600,11 +599,11 @@ def make_scenario() -> hgb.Scenario:
             "name": "Speed",
             "speed": hgb.Speed[get_value("att_speed")],
         },
-        {"name": "Skill", "value": Decimal(get_value("att_skill"))},
+        {"name": "Skill", "value": int(get_value("att_skill"))},
         {"name": "Facing", "facing": hgb.Facings[get_value("def_facing")]},
-        {"name": "CustomDice", "value": Decimal(get_value("att_dice_mod"))},
-        {"name": "CustomResult", "value": Decimal(get_value("att_result_mod"))},
-        {"name": "CustomThreshold", "value": Decimal(get_value("att_threshold_mod"))},
+        {"name": "CustomDice", "value": int(get_value("att_dice_mod"))},
+        {"name": "CustomResult", "value": int(get_value("att_result_mod"))},
+        {"name": "CustomThreshold", "value": int(get_value("att_threshold_mod"))},
         {"name": "Reroll", "rule": hgb.RerollRules[get_value("att_reroll")]},
     ]
 
@@ -617,7 +616,7 @@ def make_scenario() -> hgb.Scenario:
         att_final_traits = [t for t in att_final_traits if t["name"] != "ANN"]
 
     wpn_specials = [
-        {"name": "Damage", "value": Decimal(get_value("wpn_damage")), "source": "DAM"},
+        {"name": "Damage", "value": int(get_value("wpn_damage")), "source": "DAM"},
         {"name": "Method", "method": hgb.AttackMethods[get_value("att_method")]},
     ]
     wpn_specials.append({"name": "Range", "range": hgb.Ranges[get_value("att_range")]})
@@ -638,18 +637,18 @@ def make_scenario() -> hgb.Scenario:
     )
 
     def_specials = [
-        {"name": "Skill", "value": Decimal(get_value("def_skill"))},
+        {"name": "Skill", "value": int(get_value("def_skill"))},
         {
             "name": "Speed",
             "speed": hgb.Speed[get_value("def_speed")],
         },
-        {"name": "Armor", "value": Decimal(get_value("def_armor"))},
-        {"name": "Hull", "value": Decimal(get_value("def_hull"))},
-        {"name": "Structure", "value": Decimal(get_value("def_structure"))},
+        {"name": "Armor", "value": int(get_value("def_armor"))},
+        {"name": "Hull", "value": int(get_value("def_hull"))},
+        {"name": "Structure", "value": int(get_value("def_structure"))},
         {"name": get_value("def_type")},
-        {"name": "CustomDice", "value": Decimal(get_value("def_dice_mod"))},
-        {"name": "CustomResult", "value": Decimal(get_value("def_result_mod"))},
-        {"name": "CustomThreshold", "value": Decimal(get_value("def_threshold_mod"))},
+        {"name": "CustomDice", "value": int(get_value("def_dice_mod"))},
+        {"name": "CustomResult", "value": int(get_value("def_result_mod"))},
+        {"name": "CustomThreshold", "value": int(get_value("def_threshold_mod"))},
         {"name": "Cover", "amount": hgb.CoverAmount[get_value("def_cover")]},
         {"name": "Reroll", "rule": hgb.RerollRules[get_value("def_reroll")]},
     ]
@@ -696,10 +695,7 @@ def run_test():
         test_outcomes = list(sorted(make_scenario().evaluate(), key=attrgetter("prob")))
 
         # Run all analyses and bundle the results into a new named test
-        test = {
-            name: stats.do_analysis(test_outcomes, analysis)
-            for name, analysis in stats.analyses.items()
-        }
+        test = stats.do_analyses(test_outcomes)
         # print_test(test)
 
         global num_tests, tests
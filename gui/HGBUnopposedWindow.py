@@ -5,11 +5,12 @@ from dearpygui.dearpygui import *
 
 from diceGame.diceProbs import (
     all_probs_high_die,
-    all_probs_threshold,
     expected,
     standard_dev,
+    threshold_probs,
 )
 from .HGBGuiConstants import *
+from .ResultPlots import plot_data
 
 
 def make_unopp_window():
@@ -97,15 +98,14 @@ def update_test() -> bool:
         final_rolls = defaultdict(float)
 
         for roll, prob in base_rolls.items():
-            for bonus, bonus_prob in all_probs_threshold(
+            for bonus, bonus_prob in threshold_probs(
                 dice=dice - 1, sides=roll, val=skill
-            ).items():
+            ):
                 final_rolls[roll + bonus] = final_rolls[roll + bonus] + (
                     prob * bonus_prob
                 )
         final_rolls = {val + res_bonus: prob for val, prob in final_rolls.items()}
-        x_data = [float(x) for x in final_rolls.keys()]
-        y_data = [float(y) for y in final_rolls.values()]
+        x_data, y_data = plot_data(final_rolls)
         update_plot("roll1", "x_roll1", "y_roll1", x_data, y_data)
         show_item("roll1")
         exp = expected(final_rolls)
@@ -119,8 +119,7 @@ def update_test() -> bool:
             roll: sum(v for k, v in final_rolls.items() if k >= roll)
             for roll in final_rolls.keys()
         }
-        x_data = [float(x) for x in min_rolls.keys()]
-        y_data = [float(y) for y in min_rolls.values()]
+        x_data, y_data = plot_data(min_rolls)
         update_plot("roll2", "x_roll2", "y_roll2", x_data, y_data)
         show_item("roll2")
         mid = next(k for k, v in reversed(min_rolls.items()) if v >= 0.5)
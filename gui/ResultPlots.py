@@ -1,5 +1,7 @@
+from functools import lru_cache
 from itertools import chain
-from typing import Mapping
+from operator import mul
+from typing import Dict, List, Mapping, Tuple
 
 from dearpygui.dearpygui import *
 
@@ -9,17 +11,59 @@ from .HGBGuiConstants import *
 test = Mapping[str, stats.Result]
 
 
-def show_plots(show: Tuple[str], hide: Tuple[str]):
-    def callback(sender, app_data):
-        if app_data[0] != 0:  # left click only
-            return
-        nonlocal show, hide
-        for plot in hide:
-            hide_item(plot)
-        for plot in show:
-            show_item(plot)
+def plot_data(totals: Mapping[float, float]) -> Tuple[List[float], List[float]]:
+    """Split a totals dict into x and y float lists in a single pass."""
+    data_x, data_y = [], []
+    for k, v in totals.items():
+        data_x.append(float(k))
+        data_y.append(float(v))
+    return (data_x, data_y)
 
-    return callback
+
+# Plots to show and hide when each click handler fires, keyed by handler ID
+_plot_cycles: Dict[int, Tuple[Tuple[int], Tuple[int]]] = {}
+
+
+def cycle_plots(sender, app_data):
+    """Click callback shared by every plot. Shows the next plot type in the clicked
+    row by looking up the plots registered for the handler that fired."""
+    if app_data[0] != 0:  # left click only
+        return
+    show, hide = _plot_cycles[sender]
+    for plot in hide:
+        hide_item(plot)
+    for plot in show:
+        show_item(plot)
+
+
+# Handler registries live outside the plot window, so they are kept and reused when
+# the plots are redrawn rather than piling up
+_idle_registries: List[int] = []
+_used_registries: List[int] = []
+
+
+def get_handler_registry() -> int:
+    """Return an empty item handler registry, reusing an idle one if possible"""
+    if _idle_registries:
+        registry = _idle_registries.pop()
+    else:
+        registry = add_item_handler_registry()
+    _used_registries.append(registry)
+    return registry
+
+
+def release_handler_registries():
+    """Empty every registry handed out by get_handler_registry() for reuse"""
+    for registry in _used_registries:
+        delete_item(registry, children_only=True)
+    _idle_registries.extend(_used_registries)
+    _used_registries.clear()
+
+
+def add_cycle_handler(registry: int, show: Tuple[int], hide: Tuple[int]):
+    """Add a click handler to a registry that shows and hides the given plots"""
+    handler = add_item_clicked_handler(parent=registry, callback=cycle_plots)
+    _plot_cycles[handler] = (show, hide)
 
 
 def skip_plot(result: stats.Result) -> bool:
@@ -27,9 +71,10 @@ def skip_plot(result: stats.Result) -> bool:
     There is only one value and it is zero, indicating it didn't happen, and it is not
     configured to show anyway.
     """
+    totals = result.sources["All"]
     return (
-        result.sources["All"].average == 0
-        and len(result.sources["All"].totals) < 2
+        len(totals.totals) < 2
+        and totals.average == 0
         and not stats.analyses[result.name].show_if_missing
     )
 
@@ -45,15 +90,35 @@ def graph_results(window: int, all_tests: Mapping[str, test], selected: List[str
     for idx, name in enumerate(selected[:3]):  # Select last three tests
         set_value(test_combos[idx], name)
 
+    shown = selected[:3]
+    plots = add_group()
+
     def test_combo_cb():
-        """On test selector change, redraw window with new selected tests"""
-        nonlocal test_combos, window, all_tests
+        """On test selector change, redraw plots with new selected tests. The test
+        selectors themselves are left in place."""
+        nonlocal shown
         new_selected = [x for x in [get_value(combo) for combo in test_combos] if x]
-        graph_results(window, all_tests, new_selected)
+        if new_selected == shown:
+            return  # Same tests in the same order, so the plots are already right
+        shown = new_selected
+        render_plots(plots, all_tests, new_selected)
 
     for combo in test_combos:
         set_item_callback(combo, test_combo_cb)
 
+    render_plots(plots, all_tests, selected)
+    pop_container_stack()
+    show_item(window)
+
+
+def render_plots(container: int, all_tests: Mapping[str, test], selected: List[str]):
+    """Replace the contents of a container with a grid of plots for the selected
+    tests."""
+    push_container_stack(container)
+    delete_item(container, children_only=True)
+    release_handler_registries()
+    for handler in [h for h in _plot_cycles if not does_item_exist(h)]:
+        del _plot_cycles[handler]  # Forget handlers emptied out of their registries
     add_text("Click plots to cycle between analysis types!")
     tests = {name: all_tests[name] for name in selected}
     # cols = max(
@@ -81,50 +146,35 @@ def graph_results(window: int, all_tests: Mapping[str, test], selected: List[str
                 no_reorder=True,
                 no_sort=True,
             )
-        analyses = chain.from_iterable(test.keys() for test in tests.values())
-        analyses = list(dict.fromkeys(analyses))  # Deduplicate analysis names
-        for analysis in analyses:
-            # skip missing
-            if all(skip_plot(test[analysis]) for test in tests.values()):
+        # Walk every test's results once, collecting analysis names in order and
+        # whether each one is missing from all tests
+        skip = {}
+        for results in tests.values():
+            for analysis, result in results.items():
+                skip[analysis] = skip.get(analysis, True) and skip_plot(result)
+        for analysis, missing in skip.items():
+            if missing:
                 continue
             # Create and render a row of plots and get IDs for each created plot.
             base_plots, normal_plots, min_plots = plot_result(tests, analysis)
 
             # Create click handlers for plots
-            base_handler = add_item_handler_registry()
-            normal_handler = add_item_handler_registry()
-            min_handler = add_item_handler_registry()
-
-            if normal_plots:
-                show = normal_plots
-                hide = base_plots + min_plots
-            elif min_plots:
-                show = min_plots
-                hide = base_plots + min_plots
-            else:
-                show = base_plots
-                hide = tuple()
+            base_handler = get_handler_registry()
+            normal_handler = get_handler_registry()
+            min_handler = get_handler_registry()
+
+            # (show, hide) for each plot type. Clicks cycle base -> normal -> min,
+            # skipping types with no plots.
+            to_base = (base_plots, normal_plots + min_plots)
+            to_normal = (normal_plots, base_plots + min_plots)
+            to_min = (min_plots, base_plots + normal_plots)
+            after_normal = to_min if min_plots else to_base
+            after_base = to_normal if normal_plots else after_normal
 
             # Configure click handlers to cycle to next plot type
-            add_item_clicked_handler(
-                parent=base_handler,
-                callback=show_plots(show, hide),
-            )
-
-            if min_plots:
-                show = min_plots
-                hide = base_plots + normal_plots
-            else:
-                show = base_plots
-                hide = normal_plots
-            add_item_clicked_handler(
-                parent=normal_handler, callback=show_plots(show, hide)
-            )
-
-            add_item_clicked_handler(
-                parent=min_handler,
-                callback=show_plots(base_plots, normal_plots + min_plots),
-            )
+            add_cycle_handler(base_handler, *after_base)
+            add_cycle_handler(normal_handler, *after_normal)
+            add_cycle_handler(min_handler, *to_base)
 
             for plot in base_plots:
                 bind_item_handler_registry(plot, base_handler)
@@ -136,20 +186,19 @@ def graph_results(window: int, all_tests: Mapping[str, test], selected: List[str
                 hide_item(plot)
 
     pop_container_stack()
-    show_item(window)
 
 
 def plot_result(tests: Mapping[str, test], analysis: str) -> Tuple[Tuple[int]]:
     """Create labels and plots for all sources from one analysis in a single row.
     Returns plot IDs from each source and plot type."""
-    base_label = f"{analysis}"
-    normal_label = f"WHEN {analysis} > 0"
-    min_label = f"{analysis} AT LEAST X:"
+    labels = (f"{analysis}", f"WHEN {analysis} > 0:", f"{analysis} AT LEAST X:")
     groups = []
 
+    analysis_results = {name: test[analysis] for name, test in tests.items()}
+
     with table_row(height=PLOT_HEIGHT + 5):
         source_names = chain.from_iterable(
-            test[analysis].sources for test in tests.values()
+            result.sources for result in analysis_results.values()
         )
         source_names = list(dict.fromkeys(source_names))  # Deduplicate source names
 
@@ -157,20 +206,25 @@ def plot_result(tests: Mapping[str, test], analysis: str) -> Tuple[Tuple[int]]:
             source_names = ["All"]
 
         for source_name in source_names:
+            # Tests without this source get an empty result to keep plots aligned
             results = {
-                name: test[analysis].sources[source_name]
-                for name, test in tests.items()
+                name: result.sources.get(source_name)
+                or stats.SourceResult(source_name, result.type)
+                for name, result in analysis_results.items()
             }
-            base_label = f"{analysis}"
-            normal_label = f"WHEN {analysis} > 0:"
-            min_label = f"{analysis} AT LEAST X:"
-            if source_name != "All":
-                base_label += f" from {source_name}"
-                normal_label += f"\n{analysis} from source: {source_name}"
-                min_label += f"\n{analysis} from source: {source_name}"
+            if source_name == "All":
+                source_labels = labels
+            else:
+                base_label, normal_label, min_label = labels
+                from_source = f"\n{analysis} from source: {source_name}"
+                source_labels = (
+                    f"{base_label} from {source_name}",
+                    normal_label + from_source,
+                    min_label + from_source,
+                )
 
             groups.append(
-                make_plot_group(results, (base_label, normal_label, min_label))
+                make_plot_group(results, source_labels)
             )  # Make and add standard, normalized, and min plots for this source
 
     # transpose and return list of groups
@@ -181,55 +235,47 @@ def make_plot_group(
     results: Mapping[str, stats.SourceResult], labels: Tuple[str]
 ) -> Tuple[int]:
     """Make and render the bar plots for a single analysis and source.
-    Returns tuple of IDs."""
+    Returns tuple of IDs, or Nones if no test has any results to plot."""
+    source_results = tuple(results.values())
+    names = list(results)
+    if not any(result.totals for result in source_results):
+        return (None, None, None)
     base_label, normal_label, min_label = labels
-    datatype = list(results.values())[0].type
+    datatype = source_results[0].type
     with table_cell():
+        data = [plot_data(result.totals) for result in source_results]
         base_plot = bar_plot(
             label=base_label,
             height=PLOT_HEIGHT,
             width=PLOT_WIDTH,
-            data_x=[[float(k) for k in result.totals] for result in results.values()],
-            data_y=[
-                [float(v) for v in result.totals.values()]
-                for result in results.values()
-            ],
-            names=list(results),
+            data_x=[x for x, _ in data],
+            data_y=[y for _, y in data],
+            names=names,
             datatype=datatype,
         )
         normal_plot = None
         min_plot = None
         if datatype == stats.AnalysisType.RANGE:
+            data = [plot_data(result.normalized_totals) for result in source_results]
             normal_plot = bar_plot(
                 label=normal_label,
                 height=PLOT_HEIGHT,
                 width=PLOT_WIDTH,
-                data_x=[
-                    [float(k) for k in result.normalized_totals]
-                    for result in results.values()
-                ],
-                data_y=[
-                    [float(v) for v in result.normalized_totals.values()]
-                    for result in results.values()
-                ],
-                names=list(results),
+                data_x=[x for x, _ in data],
+                data_y=[y for _, y in data],
+                names=names,
                 datatype=datatype,
             )
 
-            if any(result.min_totals for result in results.values()):
+            if any(result.min_totals for result in source_results):
+                data = [plot_data(result.min_totals) for result in source_results]
                 min_plot = bar_plot(
                     label=min_label,
                     height=PLOT_HEIGHT,
                     width=PLOT_WIDTH,
-                    data_x=[
-                        [float(k) for k in result.min_totals]
-                        for result in results.values()
-                    ],
-                    data_y=[
-                        [float(v) for v in result.min_totals.values()]
-                        for result in results.values()
-                    ],
-                    names=list(results),
+                    data_x=[x for x, _ in data],
+                    data_y=[y for _, y in data],
+                    names=names,
                     datatype=datatype,
                     show_average=False,
                 )
@@ -237,6 +283,22 @@ def make_plot_group(
     return (base_plot, normal_plot, min_plot)
 
 
+@lru_cache(maxsize=256)
+def percent_ticks(values: Tuple[float, ...]) -> Tuple[Tuple[str, float], ...]:
+    """Axis ticks labelling each distinct value as a percentage, in order. Cached,
+    since re-running the same tests redraws plots with the same probabilities."""
+    return tuple((f"{y:0.2%}", y) for y in sorted(set(values)))
+
+
+def thin_ticks(
+    ticks: Tuple[Tuple[str, float]], length: int
+) -> Tuple[Tuple[str, float]]:
+    """Keep only evenly spaced ticks if labelling every one would crowd an axis of
+    the given length in pixels. Labels closer than that can't be read anyway."""
+    step = -(-len(ticks) * MIN_TICK_SPACING // length)  # Round up
+    return ticks[::step] if step > 1 else ticks
+
+
 # TODO: Add floating tooltip keyed to X position that displays y-values clearly
 def bar_plot(
     label: str,
@@ -260,37 +322,43 @@ def bar_plot(
     data_x = [x if x else [0.0] for x in data_x]
     data_y = [y if y else [1.0] for y in data_y]
 
+    all_x = tuple(chain.from_iterable(data_x))
+    all_y = tuple(chain.from_iterable(data_y))
+
     # Zoom plot to keep bars legible
-    x_min = min(chain.from_iterable(data_x)) - 0.8
-    x_max = max(chain.from_iterable(data_x)) + 0.8
-    y_max = max(chain.from_iterable(data_y)) * 1.2
+    x_min = min(all_x) - 0.8
+    x_max = max(all_x) + 0.8
+    y_max = max(all_y) * 1.2
 
     x_axis = add_plot_axis(parent=plot, axis=mvXAxis)
     if datatype == stats.AnalysisType.BOOL:
         set_axis_ticks(x_axis, (("No", 0), ("Yes", 1)))
     elif datatype == stats.AnalysisType.RANGE:
-        labels = [str(int(x)) for x in chain.from_iterable(data_x)]
-        set_axis_ticks(x_axis, tuple(zip(labels, chain.from_iterable(data_x))))
+        # Series share x values, so only label each one once
+        x_ticks = tuple((str(int(x)), x) for x in sorted(set(all_x)))
+        set_axis_ticks(x_axis, thin_ticks(x_ticks, width))
     y_label = "Probability %"
     y_axis = add_plot_axis(parent=plot, axis=mvYAxis, label=y_label)
-    labels = [f"{y:0.2%}" for y in chain.from_iterable(data_y)]
-    set_axis_ticks(y_axis, tuple(zip(labels, chain.from_iterable(data_y))))
-
+    set_axis_ticks(y_axis, thin_ticks(percent_ticks(all_y), height))
+
+    # Bars for each series sit side by side, centered on each x value
+    weight = BAR_WIDTH / len(data_y)
+    left = (len(data_y) - 1) * -(weight / 2)
+    if not show_average:
+        avg_fmt = None
+    elif datatype == stats.AnalysisType.BOOL:
+        avg_fmt = " (Avg: {:0.1%})".format
+    else:
+        avg_fmt = " (Avg: {:0.2f})".format
     for idx, (series_x, series_y, name) in enumerate(zip(data_x, data_y, names)):
-        weight = BAR_WIDTH / len(data_y)
-        left = (len(data_y) - 1) * -(weight / 2)
         offset = left + (idx * weight)
-        avg = sum(x * y for x, y in zip(series_x, series_y))
-        if datatype == stats.AnalysisType.BOOL:
-            avg_label = f" (Avg: {avg:0.1%})"
-        else:
-            avg_label = f" (Avg: {avg:0.2f})"
-        if not show_average:
-            avg_label = ""
+        label = name
+        if avg_fmt is not None:
+            label += avg_fmt(sum(map(mul, series_x, series_y)))
         add_bar_series(
             [x + offset for x in series_x],
             series_y,
-            label=f"{name}{avg_label}",
+            label=label,
             parent=y_axis,
             weight=weight,
         )